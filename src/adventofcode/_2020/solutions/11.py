@@ -2,56 +2,64 @@ import numpy as np
 
 from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
 from adventofcode.helpers.base_matrix_v1 import BaseMatrixV1
+from adventofcode.helpers.bit_grid import BitGrid
+from adventofcode.helpers.ray_cast import RayTable
 
 
 class Matrix(BaseMatrixV1):
     def simulate(self, look_far: bool = False):
-        tolerance = 4 if not look_far else 5
-        new_data = self.data.copy()
-        for i, j in self.iter_topleft_to_bottomright():
-            if look_far:
-                neighbors = self.get_visible_seats(i, j)
-            else:
-                neighbors = self.adjacent_fields(i, j, as_values=True)
-            if self.data[i, j] == "L" and "#" not in neighbors:
-                new_data[i, j] = "#"
-            if self.data[i, j] == "#" and neighbors.count("#") >= tolerance:
-                new_data[i, j] = "L"
-        if not np.array_equal(self.data, new_data):
-            self.data = new_data
-            self.simulate(look_far)
+        if look_far:
+            self.simulate_visible()
+        else:
+            self.simulate_adjacent()
+
+    def simulate_adjacent(self):
+        """Simulate until stable, looking at adjacent seats only. All seats are updated
+        at once per round, on bit grids of the seats and of the occupied seats:
+
+        - An empty seat becomes occupied if no adjacent seat is occupied
+        - An occupied seat becomes empty if 4 or more adjacent seats are occupied
+        """
+        seats = BitGrid.from_array(self.data != ".")
+        occupied = BitGrid.from_array(self.data == "#")
+        while True:
+            crowded = occupied.neighbors_at_least(1)
+            new_occupied = (seats & ~occupied & ~crowded) | (
+                occupied & ~occupied.neighbors_at_least(4)
+            )
+            if new_occupied == occupied:
+                break
+            occupied = new_occupied
+        self.data[seats.to_array()] = "L"
+        self.data[occupied.to_array()] = "#"
+
+    def simulate_visible(self):
+        """Simulate until stable, looking at the first seat in each direction. The
+        visible seats are looked up once in a ray table, after which all seats are
+        updated at once per round:
+
+        - An empty seat becomes occupied if no visible seat is occupied
+        - An occupied seat becomes empty if 5 or more visible seats are occupied
+        """
+        seats = self.data != "."
+        rays = RayTable(seats)
+        visible = np.stack([rays.targets(d).ravel() for d in rays.directions])
+        # One extra, never occupied seat at the end, for the rays that see no seat (-1)
+        occupied = np.append((self.data == "#").ravel(), False)
+        while True:
+            counts = occupied[visible].sum(axis=0)
+            new_occupied = seats.ravel() & np.where(
+                occupied[:-1], counts < 5, counts == 0
+            )
+            if np.array_equal(new_occupied, occupied[:-1]):
+                break
+            occupied[:-1] = new_occupied
+        self.data[seats] = "L"
+        self.data[occupied[:-1].reshape(seats.shape)] = "#"
 
     def occupied_seats(self):
         return np.count_nonzero(self.data == "#")
 
-    def get_visible_seat(self, i, j, direction):
-        i += direction[0]
-        j += direction[1]
-        while 0 < i < self.data.shape[0] - 1 and 0 < j < self.data.shape[1] - 1:
-            if self.data[i, j] in ["L", "#"]:
-                return self.data[i, j]
-            i += direction[0]
-            j += direction[1]
-        return None
-
-    def get_visible_seats(self, i, j):
-        visible_seats = []
-        for direction in [
-            (1, 0),
-            (0, 1),
-            (-1, 0),
-            (0, -1),
-            (1, -1),
-            (-1, 1),
-            (1, 1),
-            (-1, -1),
-        ]:
-            visible_seat = self.get_visible_seat(i, j, direction)
-            if visible_seat:
-                visible_seats.append(visible_seat)
-                continue
-        return visible_seats
-
 
 class Puzzle11(PuzzleToSolve):
     @property
@@ -4,6 +4,8 @@ import numpy as np
 from aocd.models import Puzzle
 from numpy.typing import NDArray
 
+from adventofcode.helpers.base_matrix import label_regions
+
 
 class Point:
     """
@@ -18,9 +20,6 @@ class Point:
     r: int
     # Col index
     c: int
-    # Used when getting basins. Set to true when we are running get_basin, to prevent
-    # adding points more than once
-    marked: bool = False
 
     def __init__(self, r, c, val):
         self.r = r
@@ -58,22 +57,10 @@ class Point:
     def risk_level(self):
         return self.val + 1 if self.is_low else 0
 
-    # Item may occur in basin if bnot 9, and not marked (eg yet added to basin)
-    @property
-    def may_occur_in_basin(self):
-        return not self.marked and self.val != 9
-
-    def get_basin(self) -> List["Point"]:
-        self.marked = True
-        basin = []
-        for n in self.neighbours:
-            if n.may_occur_in_basin:
-                basin.extend(n.get_basin())
-        basin.append(self)
-        return basin
-
 
 class Matrix:
+    # Raw values
+    raw: NDArray
     # Matrix of values, but values are Point() objects
     points: NDArray
 
@@ -83,6 +70,7 @@ class Matrix:
         created, save the neighbour points in the points itself
         :param raw: (n,m) points matrix
         """
+        self.raw = raw
         self.points = np.full(raw.shape, np.nan, dtype=object)
         for r in range(raw.shape[0]):
             for c in range(raw.shape[1]):
@@ -103,13 +91,12 @@ class Matrix:
     @property
     def basin_len_sum(self) -> int:
         """
-        Get The sum of the length of the 3 largest basins
+        Get The product of the sizes of the 3 largest basins. A basin is a region of
+        connected points that are not 9
         """
-        basins = []
-        for p in self.low_points:
-            basins.append(p.get_basin())
-        # Extract len, sort, multiply top 3
-        result = np.prod(sorted([len(b) for b in basins], reverse=True)[:3])
+        basins = label_regions(self.raw, self.raw != 9, by_value=False)
+        # Sort sizes, multiply top 3
+        result = np.prod(np.sort(basins.areas)[::-1][:3])
         return result
 
 
@@ -1,112 +1,38 @@
-from itertools import combinations, permutations, product
-from typing import List
-
 import numpy as np
 from aocd.models import Puzzle
 from numpy.typing import NDArray
 
-
-class Point:
-    """
-    A matrix consists of points. A point has a value, position, and neighbours
-    """
-
-    # List of neighbouring points.
-    neighbours: List["Point"]
-    # Raw val
-    val: int
-    # Row index
-    r: int
-    # Col index
-    c: int
-    # Used when iterating. Set to true when we have flashed, to prevent flashing more
-    # than once
-    marked: bool = False
-
-    def __init__(self, r, c, val):
-        self.r = r
-        self.c = c
-        self.val = val
-
-    def save_neighbors(self, matrix):
-        """
-        Get the neighbours of the matrix, save them
-        """
-        results = []
-        for ri, ci in product([-1, 0, 1], [-1, 0, 1]):
-            r = self.r + ri
-            c = self.c + ci
-            if self._valid(matrix, r, c):
-                results.append(matrix.points[r, c])
-        self.neighbours = results
-
-    # Check index bounds for neighbours
-    def _valid(self, matrix, r, c) -> bool:
-        return (
-            not (r == self.r and c == self.c)
-            and 0 <= r < matrix.points.shape[0]
-            and 0 <= c < matrix.points.shape[1]
-        )
-
-    def __eq__(self, other):
-        return self.r == other.r and self.c == other.c
-
-    def tick(self):
-        self.val += 1
-
-    def flash(self):
-        # Don't flash if yet flashed or val not > 9
-        if self.marked or self.val <= 9:
-            return
-        self.marked = True
-        for point in self.neighbours:
-            point.tick()
-            point.flash()
-
-    def unmark(self) -> bool:
-        """
-        If was marked, unmark and set val to 0
-        :return:  True if was marked
-        """
-        if self.marked:
-            self.val = 0
-            self.marked = False
-            return True
-        return False
+from adventofcode.helpers.bit_grid import BitGrid
 
 
 class Matrix:
-    # Matrix of values, but values are Point() objects
-    points: NDArray
+    # Energy level of each octopus
+    energy: NDArray
 
     def __init__(self, raw: NDArray):
         """
-        Upon create: Save raw, save matrix of points. After all points have been
-        created, save the neighbour points in the points itself
-        :param raw: (n,m) points matrix
+        Upon create: Save a copy of the raw energy levels
+        :param raw: (n,m) energy matrix
         """
-        self.points = np.full(raw.shape, np.nan, dtype=object)
-        for r in range(raw.shape[0]):
-            for c in range(raw.shape[1]):
-                self.points[r, c] = Point(r, c, raw[r, c])
-        for r in range(raw.shape[0]):
-            for c in range(raw.shape[1]):
-                self.points[r, c].save_neighbors(self)
+        self.energy = raw.copy()
 
     def iterate_once(self):
         """
-        Iterate all points once, eg:
-        - Tick each point
-        - Flash each point, if it must be flashed. Point will flash its neighbours
-        - Unmark each flashed point
-        :return: Number of flashed points
-        """
-        points = self.points.flatten()
-        for point in points:
-            point.tick()
-        for point in points:
-            point.flash()
-        return sum(point.unmark() for point in points)
+        Iterate all octopuses once, eg:
+        - Tick each octopus
+        - Flash all octopuses with a level > 9 that did not flash yet, at once. Each
+          flash ticks its neighbours, count those with the flashes as a bit grid.
+          Repeat until no new octopus flashes
+        - Reset each flashed octopus to 0
+        :return: Number of flashed octopuses
+        """
+        self.energy += 1
+        flashed = BitGrid(0, *self.energy.shape)
+        while new := BitGrid.from_array(self.energy > 9) & ~flashed:
+            flashed |= new
+            self.energy += new.neighbor_counts()
+        self.energy[flashed.to_array()] = 0
+        return flashed.count()
 
     def iterate(self, n: int):
         """
@@ -122,7 +48,7 @@ class Matrix:
         i = 0
         while True:
             i += 1
-            if self.iterate_once() == np.prod(self.points.shape):
+            if self.iterate_once() == self.energy.size:
                 return i
 
 
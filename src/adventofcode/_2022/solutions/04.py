@@ -1,3 +1,4 @@
+from adventofcode.helpers.interval_set import IntervalSet
 from src._2022.puzzle_to_solve import PuzzleToSolve
 
 
@@ -59,10 +60,9 @@ class Puzzle4(PuzzleToSolve):
 
         cnt = 0
         for pair in pairs_parsed:
-            left_range = range(pair[0][0], pair[0][1] + 1)
-            right_range = range(pair[1][0], pair[1][1] + 1)
-            overlap = list(set(left_range) & set(right_range))
-            if len(overlap) > 0:
+            left_range = IntervalSet.from_inclusive([pair[0]])
+            right_range = IntervalSet.from_inclusive([pair[1]])
+            if left_range & right_range:
                 cnt += 1
         return cnt
 
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 import numpy as np
 from numpy.typing import NDArray
 
+from adventofcode.helpers.base_matrix import Position
+from adventofcode.helpers.ray_cast import RayTable
 from src._2022.puzzle_to_solve import PuzzleToSolve
 
 
@@ -23,62 +25,44 @@ class Grid:
         input = input.replace("\n", ";")
         self.matrix = np.array(np.matrix(input))
 
+    def ray_tables(self) -> dict[int, RayTable]:
+        """
+        For each tree height, how far the view from each tree reaches in each direction
+        before a tree of at least that height blocks it. A tree only uses the table of
+        its own height.
+        """
+        return {
+            height: RayTable(
+                self.matrix >= height, Position.directions(include_diagonal=False)
+            )
+            for height in np.unique(self.matrix)
+        }
+
     def get_best_tree(self):
         """
         Get the tree with the highest scening score:
-        - Loop over each tree, for each tree compute the scenic score by multiplying:
-            - Look left: If at left, 0. Else find the most right treeI that is higher then self, return selfI
-                (the viewing distance). If not found, the most right tree is at 0, hence distance is selfI
-            - Look right: if at right, 0. Else find most left tree that is higher then self
-                (add j+1, since index is only over the sublist, hence increase with len of part before sublist). If not
-                found return max_j (most right tree). View is the found treeI - selfI.
-            - Look up similar to left
-            - Look down similar to right
+        - The viewing distance in a direction is the number of steps to the first tree
+            that is at least as high, or to the edge if there is none
+        - The scenic score is the product of the viewing distances in all directions
         - Return the max scenic view
         """
         scening_scores = np.zeros(self.matrix.shape, dtype=int)
-        max_i = self.matrix.shape[0] - 1
-        max_j = self.matrix.shape[1] - 1
-        for i in range(self.matrix.shape[0]):
-            for j in range(self.matrix.shape[1]):
-                tree_len = self.matrix[i, j]
-                scening_scores[i, j] = (
-                    # Look left
-                        (0 if j == 0 else j - max(np.argwhere(self.matrix[i, :j] >= tree_len), default=0)) *
-                        # Look right
-                        (0 if j == max_j else min(np.argwhere(self.matrix[i, j + 1:] >= tree_len) + j + 1,
-                                                  default=max_j) - j) *
-                        # Look up
-                        (0 if i == 0 else i - max(np.argwhere(self.matrix[:i, j] >= tree_len), default=0)) *
-                        # Look down
-                        (0 if i == max_i else min(np.argwhere(self.matrix[i + 1:, j] >= tree_len) + i + 1,
-                                                  default=max_i) - i)
-                )
-
+        for height, rays in self.ray_tables().items():
+            trees = self.matrix == height
+            # Without a blocking tree, the last step leaves the map
+            distances = np.where(rays.hits, rays.steps, rays.steps - 1)
+            scening_scores[trees] = np.prod(distances, axis=0)[trees]
         return np.max(scening_scores)
 
     def count_trees(self):
         """
-        Count trees that are visible from outside the map:
-        - Loop over all trees. For each tree, check whether it is visible by:
-            - If is at outer, yes
-            - Else if all to the [left|right|up|down] are smaller, yes
-        - Return the sum of the treest that are visible
+        Count trees that are visible from outside the map: a tree is visible if its view
+        in any direction reaches the edge, without a tree of at least its height
         """
         visible_trees = np.zeros(self.matrix.shape, dtype=bool)
-        max_i = self.matrix.shape[0] - 1
-        max_j = self.matrix.shape[1] - 1
-        for i in range(self.matrix.shape[0]):
-            for j in range(self.matrix.shape[1]):
-                tree_len = self.matrix[i, j]
-                visible_trees[i, j] = (
-                        i == 0 or j == 0 or i == max_i or j == max_j or  # Outer
-                        max(self.matrix[i, :j]) < tree_len or  # Look left
-                        max(self.matrix[i, j + 1:]) < tree_len or  # Look right
-                        max(self.matrix[:i, j]) < tree_len or  # Look up
-                        max(self.matrix[i + 1:, j]) < tree_len  # Look down
-
-                )
+        for height, rays in self.ray_tables().items():
+            trees = self.matrix == height
+            visible_trees[trees] = np.any(~rays.hits, axis=0)[trees]
         return np.count_nonzero(visible_trees)
 
 
@@ -1,9 +1,9 @@
 import string
-from typing import Tuple
 
 import numpy as np
 from numpy.typing import NDArray
 
+from adventofcode.helpers.shortest_path import INFINITY, GridPathFinder
 from src._2022.puzzle_to_solve import PuzzleToSolve
 
 
@@ -19,17 +19,12 @@ class Map:
         The goal height (27)
      distances_to_start: NDArray
         Set during Dijkstras. Contains in each cell the least amount of steps needed to go from the start cell to here
-    visited_nodes: NDArray
-        Boolean array. All false at start. During Dijkstra, set to true whenever a cell is visited (such that we
-        wont re-visit)
     climbing: bool
         Set to True for b). In b), we want to compute all distances to the end (such that we can then find the 'a' cell
         with the smallest distance to end). When true, we change the algorithm as follows:
         - The height of the start node (which is actually the end node) is set to 27 (max height)
         - The start position is the node with height max, instead of height 0
         - During Sijkstras, we disallow movements to more than 1 lower, instead of to more than 1 higher
-    DIRECTIONS: List[Tuple[int, int]]
-        List of possible directions to go to from a cell (delta)
     max_val: int
         Used as max int. Dont use sys.maxsize to prevent memory errors.
 
@@ -39,15 +34,8 @@ class Map:
     letter_to_height = 'S' + string.ascii_lowercase + 'E'
     goal = letter_to_height.index('E')
     distances_to_start: NDArray
-    visited_nodes: NDArray
     climbing: bool
 
-    DIRECTIONS = [
-        (0, -1),
-        (-1, 0),
-        (0, 1),
-        (1, 0),
-    ]
     max_val = 99999999
 
     def __init__(self, input_: str, climbing=True):
@@ -59,7 +47,7 @@ class Map:
         Parse the input. Replace all letters with the height of the letter. Split items by ' ' and replace newlines with
         ';'. Now np.matrix() reads correctly, then convert to ndarray. If self.climbing, set the height of the start
         node to self.goal: In this case we start at the end, hence the start isn't at height 0 but at hight max. Set
-        distances to start to max, except for start. Set visited nodes to all false
+        distances to start to max, except for start
         """
         int_input = ' '.join(
             [str(self.letter_to_height.index(x)) if x in self.letter_to_height else x for x in input_]).replace(" \n",
@@ -69,52 +57,26 @@ class Map:
             self.matrix[tuple(np.argwhere(self.matrix == 0)[0])] = self.goal
         self.distances_to_start = np.full(self.matrix.shape, self.max_val, dtype=int)
         self.distances_to_start[self.start_pos] = 0
-        self.visited_nodes = np.full(self.matrix.shape, 0, dtype=bool)
 
-    def compute_min_distances_to_start_for_neighbors_of(self, pos: Tuple[int, int]):
+    def can_move(self, from_cell: int, to_cell: int) -> bool:
         """
-        Given that the min_distance_to_start for pos is set, compute the distances_to_start for all its neighbors
-        - For all directions (top left bottom right):
-            - If going this direction is outside of the matrix, skip it
-            - If this direction is more than 1 up (climbing) or down (not climbing), skip it: Cannot go here
-            - Else set the distances_to_start of the new cell to the minimum of the current distances_to_start of that cell,
-                and the current distance + 1
-        - Set self to visited
-        - Return True if all nodes are visited
+        Check whether we can step from one cell to another (flat indices): not more than 1 up (climbing) or down (not
+        climbing)
         """
-        current_distance = self.distances_to_start[pos]
-        for direction in self.DIRECTIONS:
-            new_pos = tuple(np.array(pos) + direction)
-
-            # If cannot index, out of board. skip
-            if self.matrix.shape[0] - 1 < new_pos[0] or new_pos[0] < 0 or self.matrix.shape[1] - 1 < new_pos[1] or \
-                    new_pos[1] < 0:
-                continue
-            # Cannot go here: too high
-            if (self.climbing and self.matrix[new_pos] - 1 > self.matrix[pos]) or \
-                    (not self.climbing and self.matrix[new_pos] + 1 < self.matrix[pos]):
-                continue
-
-            self.distances_to_start[new_pos] = min(self.distances_to_start[new_pos], current_distance + 1)
-        self.visited_nodes[pos] = True
-        return not np.any(np.logical_not(self.visited_nodes))
+        from_height, to_height = self.matrix.flat[from_cell], self.matrix.flat[to_cell]
+        if self.climbing:
+            return to_height - 1 <= from_height
+        return to_height + 1 >= from_height
 
     def dijkstras(self):
         """
-        Run Dijkstra's algorithm:
-        - Set the current pos to the start pos - For this pos, the min_distance_to_start is known (namely 0)
-        - compute_min_distances_to_start_for_neighbors_of for the pos
-        - Select the next node: The node with the smallest distance to start, which is unvisited.
-            If all nodes are visited, stop.
+        Run Dijkstra's algorithm from the start pos, where each step costs 1 and is restricted by can_move. Sets the
+        distances_to_start of all cells. Cells that cannot be reached get max_val
         """
-        pos = self.start_pos
-        while not self.compute_min_distances_to_start_for_neighbors_of(pos):
-            # Select next node: unvisited and lowest value
-            options_next_node = self.distances_to_start.copy()
-            options_next_node[self.visited_nodes] = self.max_val
-            pos = self.argmin_last_n_axes(options_next_node, 2)
-            if self.visited_nodes[pos]:
-                break
+        path_finder = GridPathFinder(np.ones_like(self.matrix), can_move=self.can_move)
+        distances = path_finder.distances([self.start_pos])
+        distances[distances == INFINITY] = self.max_val
+        self.distances_to_start = distances
 
     @staticmethod
     def argmin_last_n_axes(matrix, n):
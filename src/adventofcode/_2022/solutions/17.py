@@ -4,6 +4,7 @@ from dataclasses import dataclass
 import numpy as np
 from numpy.typing import NDArray
 
+from adventofcode.helpers.cycles import CycleDetector, fingerprint
 from src._2022.puzzle_to_solve import PuzzleToSolve
 
 
@@ -45,6 +46,8 @@ class Position:
 
 class Chamber:
     WIDTH = 7
+    # The number of rows at the top of the tower that are compared to detect a cycle
+    CYCLE_DEPTH = 50
     space = np.zeros((0, WIDTH), dtype=int)
 
     rocks = [
@@ -97,12 +100,34 @@ class Chamber:
         if DEBUG_LEVEL > 0:
             print(self)
 
-    def insert_rocks(self, amount: int):
+    def insert_rocks(self, amount: int) -> int:
+        """
+        Insert rocks, and return the height of the tower.
+        The next rock, the next jet and the top of the tower determine how the tower grows.
+        Once these repeat, the tower grows the same each cycle, hence the height is
+        extrapolated instead of inserting all rocks.
+        """
+        detector = CycleDetector(key=self.cycle_key)
+        heights = []
         for i in range(amount):
+            heights.append(self.get_height())
+            cycle = detector.add(i)
+            if cycle is not None:
+                return cycle.extrapolate(heights, amount)
             rock_index = i % len(self.rocks)
             rock = self.rocks[rock_index]
             self.extend_cave_for(rock)
             self.insert_rock(rock)
+        return self.get_height()
+
+    def cycle_key(self, i: int):
+        """
+        The state that determines how the tower grows after i rocks: the next rock, the
+        next jet, and the top rows of the tower. Rocks do not fall deeper than that.
+        """
+        top_row = self.get_top_row()
+        top = self.space[top_row + 1:top_row + 1 + self.CYCLE_DEPTH].astype(bool)
+        return i % len(self.rocks), self.jet_pattern_index, fingerprint(top)
 
     def get_top_row(self):
         return max(np.argwhere(~self.space.any(axis=1)), default=[0])[0]
@@ -169,16 +194,12 @@ class Puzzle17(PuzzleToSolve):
 
     def a(self, input_: str):
         chamber = Chamber(input_)
-        chamber.insert_rocks(2022)
-        print(chamber)
-        result = chamber.get_height()
+        result = chamber.insert_rocks(2022)
         return result
 
     def b(self, input_: str):
         chamber = Chamber(input_)
-        chamber.insert_rocks(1000000000000)
-        print(chamber)
-        result = chamber.get_height()
+        result = chamber.insert_rocks(1000000000000)
         return result
 
 DEBUG_LEVEL=0
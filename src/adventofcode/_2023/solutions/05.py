@@ -1,4 +1,5 @@
 from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
+from adventofcode.helpers.interval_set import IntervalSet
 from typing import List, Tuple
 import re
 
@@ -34,84 +35,22 @@ class Alamanc:
             print("Done one map")
         return min(sources)
 
-    def map_if_possible(self, source_range_start, source_range_len, mapped_dest_range_start, mapped_source_range_start, range_len) -> Tuple[Tuple[int, int], List[Tuple[int, int]]]:
-        """
-        Check if the source_range can be mapped to the mapped_dest_range. If so, return the mapped_dest_range and the remaining ranges to be mapped. If not, return None and the source_range
-        
-        Args:
-            source_range_start (int): Start of the source range (the to-be-mapped range)
-            source_range_len (int): Length of the source range (the to-be-mapped range)
-            mapped_dest_range_start (int): Start of the mapped dest range (the range to which the source range is mapped)
-            mapped_source_range_start (int): Start of the mapped source range (the start part of the source that are mapped by this map-entry)
-            range_len (int): Length of the mapped source range (mapped_source_range_start + range_len is the full source range that is mapped by this map-entry)
-        Returns:
-            Tuple[Tuple[int, int], List[Tuple[int, int]]]: The mapped dest range and the remaining ranges to be mapped. If the source range cannot be mapped, return None and the source range
-        """
-        # If the end of the source range is before the start of the mapped source range, or the start of the source range is after the end of the mapped source range, there is no overlap
-        if source_range_start + source_range_len <= mapped_source_range_start or mapped_source_range_start + range_len <= source_range_start:
-            return None, [(source_range_start, source_range_len)]
-        else:
-            # Some part overlaps, so we need to map this part
-            # The start of the matching part is the max of the start of the mapped source range and the start of the source range
-            matched_part_start = max(mapped_source_range_start, source_range_start)
-            # The end of the matching part is the min of the end of the mapped source range and the end of the source range
-            matched_part_end = min(mapped_source_range_start + range_len, source_range_start + source_range_len)
-            # The length of the matching part is the difference between the start and the end
-            matched_part_len = matched_part_end - matched_part_start
-            # Map the start of the matching part to the value in the mapped dest range
-            matched_part_start_in_dest = mapped_dest_range_start + (matched_part_start - mapped_source_range_start)
-            # The dest range is the start value mapped in the dest range, and the length of the matching part
-            matched_dest_range = matched_part_start_in_dest, matched_part_len
-            
-            # If the match is not a complete match (ie start or end of the source does not fall in the dest), we need to compute and return the remaining ranges
-            remaining_ranges = []
-            # If the source range has some values before the matched part
-            if matched_part_start > source_range_start:
-                # Add the part before the start of the matched part to the remaining ranges
-                remaining_ranges.append((source_range_start, matched_part_start - source_range_start))
-            # If the source range has some values after the matched part
-            if matched_part_end < source_range_start + source_range_len:
-                # Add the part after the end of the matched part to the remaining ranges
-                remaining_ranges.append((matched_part_end, source_range_start + source_range_len - matched_part_end))
-            return matched_dest_range, remaining_ranges
-    
     def find_closest_location_given_ranges(self):
         """
         Smarter solution for part b). Use ranges instead of looping over each source
-        - Convert the sources into range. A range is a tuple, (start, len)
-        - Loop over each map, for each map
-        - Loop over each range_to_be_mapped. For each range_to_be_mapped
-        - Loop over each map-entry. For each map-entry
-        - If the range_to_be_mapped is (partly) in the range of the map-entry, map that part. The unmapped parts are added to the unmapped_ranges, to be mapped by subsequent map-entries of this map
-        - If all entries of a map are applied, the mapped_ranges + the unmapped_ranges are the new ranges_to_be_mapped. This makes the unmapped_ranges to be mapped to themselves in this map
-        - If all maps are applied, all ranges have been mapped. The result are the ranges mapped through all maps
-        - Return the start of the range with the lowest start
+        - Convert the sources into an interval set. A seed range (start, len) is the interval [start, start + len)
+        - Loop over each map. Each map-entry moves the part of the set in its source range to its dest range.
+          The parts that are in no source range are mapped to themselves. Ranges that span several entries are split
+        - If all maps are applied, all ranges have been mapped. Return the lowest value in the set
         """
         sources = self.sources
-        source_ranges = [(sources[i], sources[i+1]) for i in range(0, len(sources), 2)]
-        ranges_to_map = source_ranges
+        ranges = IntervalSet((sources[i], sources[i] + sources[i+1]) for i in range(0, len(sources), 2))
         for map in self.maps:
-            mapped_ranges = []
-            for mapped_dest_range_start, mapped_source_range_start, range_len in map:
-                # Keep track of the ranges that are not mapped by this map-entry
-                unmapped_ranges = []
-                # Try to map each range_to_map
-                for source_range_start, source_range_len in ranges_to_map:
-                    # Map if possible
-                    mapped_range, remaining_ranges = self.map_if_possible(source_range_start, source_range_len, mapped_dest_range_start, mapped_source_range_start, range_len)
-                    # Add the part that can be mapped by this map-entry to the mapped_ranges
-                    if mapped_range:
-                        mapped_ranges.append(mapped_range)
-                    # The parts that are not mapped, are added to the unmapped_ranges
-                    unmapped_ranges.extend(remaining_ranges)
-                # All source ranges that were mappable by this map-entry are now mapped.
-                # The remaining ranges are only the unmapped ranges, as each unmapped range was added to this list
-                ranges_to_map = unmapped_ranges
-            # All map entries are applied to all ranges_to_map. We now have the mapped ranges and the ranges that still need to be mapped. 
-            # The ranges that are still to be mapped are mapped to their original value, hence ranges_to_map = mapped_ranges + ranges_to_map
-            ranges_to_map = mapped_ranges + ranges_to_map
-        # All maps are applied to all ranges_to_map. We now have the mapped ranges and the ranges that still need to be mapped. Return the start of the range with the lowest start
-        return min(ranges_to_map, key=lambda x: x[0])[0]
+            ranges = ranges.map_pieces(
+                (source_range_start, source_range_start + range_len, dest_range_start - source_range_start)
+                for dest_range_start, source_range_start, range_len in map
+            )
+        return ranges.starts[0]
 
 class Puzzle5(PuzzleToSolve):
     @property
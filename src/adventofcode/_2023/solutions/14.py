@@ -3,41 +3,23 @@ from numpy import ndarray
 
 from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
 from adventofcode.helpers.base_matrix_v1 import BaseMatrixV1
+from adventofcode.helpers.cycles import fingerprint, iterate
 
 # def
 
 
 class Dish(BaseMatrixV1):
-    encountered_patterns: dict
-
     def spin(self, times: int):
         """
         Spin the dish a number of times.
-        After each spin, check whether the pattern has been encountered before. If so, we can skip cycles.
-        """
-        self.encountered_patterns = {}
-        i = 0
-        while i < times:
-            self.spin_once()
-            new_i = self.try_skip_cycles(i)
-            self.encountered_patterns[self.__repr__()] = i
-            i = new_i
-
-    def try_skip_cycles(self, i: int):
+        Once a pattern has been encountered before, the remaining full cycles are skipped.
         """
-        Check if the current pattern has been encountered before. If so, we can skip cycles.
-        """
-        if self.__repr__() in self.encountered_patterns:
-            # Find the length of the repeating pattern
-            length_of_repeating_pattern = i - self.encountered_patterns[self.__repr__()]
-            # Skip as many times as the length fits in the remaining cycles
-            remaining_cycles = 1000000000 - i
-            i = 1000000000 - (remaining_cycles % length_of_repeating_pattern)
-        return i + 1
-
-    def spin_once(self):
+        iterate(self, Dish.spin_once, times, key=lambda dish: fingerprint(dish.data))
+
+    def spin_once(self) -> "Dish":
         for direction in ["north", "west", "south", "east"]:
             self.tilt_dish(direction)
+        return self
 
     def tilt_dish(self, direction: str):
         """
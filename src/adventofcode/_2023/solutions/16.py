@@ -1,24 +1,10 @@
 from typing import List, Tuple
 
-import numpy as np
-from numpy import ndarray
-
 from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
 from adventofcode.helpers.base_matrix_v1 import BaseMatrixV1
 
 
 class Contraption(BaseMatrixV1):
-    energy: ndarray
-    visited: List[Tuple[Tuple[int, int], Tuple[int, int]]]
-
-    def parse_input(self, input_: str, pad: str = "."):
-        super().parse_input(input_, pad)
-        self.reset()
-
-    def reset(self):
-        self.energy = np.full(self.data.shape, ".")
-        self.visited = []
-
     def new_beams(
         self, position: Tuple[int, int], direction: Tuple[int, int], type_: str
     ) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
@@ -59,16 +45,17 @@ class Contraption(BaseMatrixV1):
         """
         Process a beam, given the starting position and direction.
         do a BFS, and return the number of visited fields.
-        Visited is a list of tuples of (position, direction). This is to prevent going back and forth.
+        Visited is a set of tuples of (position, direction). This is to prevent going back and forth.
+        The contraption itself is not changed, so no state needs to be reset between beams.
         """
-        visited = []
+        visited = set()
         to_process = [((r, c), direction)]
         while len(to_process) > 0:
             (r, c), direction = to_process.pop()
             type_ = self.data[r, c]
             if ((r, c), direction) in visited or type_ == "#":
                 continue
-            visited.append(((r, c), direction))
+            visited.add(((r, c), direction))
             to_process.extend(self.new_beams((r, c), direction, type_))
         return len(set([(r, c) for (r, c), _ in visited]))
 
@@ -123,7 +110,6 @@ class Puzzle16(PuzzleToSolve):
         for i, starting_point in enumerate(starting_points):
             print(f"Processing {i} of {len(starting_points)}")
             result = max(result, contraption.process_beam(*starting_point))
-            contraption.reset()
         return result
 
     def a(self, contraption: Contraption):
@@ -1,4 +1,3 @@
-import heapq
 from typing import List, Tuple
 
 import numpy as np
@@ -6,6 +5,7 @@ from numpy import ndarray
 
 from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
 from adventofcode.helpers.base_matrix_v1 import BaseMatrixV1
+from adventofcode.helpers.shortest_path import GridPathFinder
 
 
 class Map(BaseMatrixV1):
@@ -96,69 +96,12 @@ class Map(BaseMatrixV1):
         - If min_straight_steps is given, any direction must be taken at least min_straight_steps times in a row, before turning
         - If max_straight_steps is given, any direction must be taken at most max_straight_steps times in a row, before turning
         """
-        # queue is a list of (distance, amount_steps_straight, last_direction, (r, c))
-        all_possible_directions = {(0, 1), (0, -1), (1, 0), (-1, 0)}
-        distances = np.full(self.costs.shape, fill_value=np.iinfo(int).max, dtype=int)
-        parents = np.full(self.costs.shape, fill_value=None, dtype=object)
-        queue: List[Tuple[int, int, Tuple[int, int], Tuple[int, int]]] = []
-        visited: set[Tuple[Tuple[int, int], int, Tuple[int, int]]] = set()
-
-        costs = self.costs.copy()
-        heapq.heappush(queue, (0, 0, (0, 0), (0, 0)))
-        while queue:
-            distance, amount_steps_straight, last_direction, node = heapq.heappop(queue)
-            state = (node, amount_steps_straight, last_direction)
-            if state in visited:
-                continue
-            visited.add(state)
-            possible_directions = all_possible_directions - {
-                (last_direction[0] * -1, last_direction[1] * -1)
-            }
-            for direction in possible_directions:
-                if direction == last_direction:
-                    new_amount_steps_straight = amount_steps_straight + 1
-                    if (
-                        max_straight_steps is not None
-                        and new_amount_steps_straight > max_straight_steps
-                    ):
-                        continue
-                else:
-                    if (amount_steps_straight != 0) and (
-                        min_straight_steps is not None
-                        and amount_steps_straight < min_straight_steps
-                    ):
-                        continue
-                    new_amount_steps_straight = 1
-                if (
-                    max_straight_steps is not None
-                    and new_amount_steps_straight > max_straight_steps
-                ):
-                    continue
-                r, c = node[0] + direction[0], node[1] + direction[1]
-                if 0 <= r < costs.shape[0] and 0 <= c < costs.shape[1]:
-                    new_distance = distance + costs[r, c]
-                    if new_distance < distances[r, c]:
-                        distances[r, c] = new_distance
-                        parents[r, c] = node
-                    heapq.heappush(
-                        queue,
-                        (new_distance, new_amount_steps_straight, direction, (r, c)),
-                    )
-        # Create a matrix of the path. Each cell has '.', excpet for the one in the shortest path, which has '#'. Use parents to find the path
-        self.print_parents(distances, parents)
-        print(distances[distances.shape[0] - 1, distances.shape[1] - 1])
-        return distances[distances.shape[0] - 1, distances.shape[1] - 1]
-
-    def print_parents(self, distances: ndarray, parents: ndarray):
-        result = np.full(self.costs.shape, fill_value=".")
-        node = (distances.shape[0] - 1, distances.shape[1] - 1)
-        while node != (0, 0):
-            if parents[node] is None:
-                break
-            result[node[0], node[1]] = "#"
-            node = parents[node]
-        result[0, 0] = "#"
-        print("\n".join(["".join(row) for row in result]))
+        path_finder = GridPathFinder(
+            self.costs,
+            min_straight=min_straight_steps or 0,
+            max_straight=max_straight_steps,
+        )
+        return path_finder.shortest_distance([(0, 0)], [self.end])
 
 
 class Puzzle17(PuzzleToSolve):
@@ -1,10 +1,12 @@
 from collections import defaultdict
+from typing import Generator
 
 import numpy as np
 from tqdm import tqdm
 
 from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
 from adventofcode.helpers.base_matrix import BaseMatrix, Direction, Directions, Position
+from adventofcode.helpers.ray_cast import RayTable
 
 
 class InfiniteLoopError(Exception):
@@ -13,31 +15,66 @@ class InfiniteLoopError(Exception):
 
 
 class Map(BaseMatrix):
+    start: Position
+    rays: RayTable
+
     def __init__(self, input_: str):
         super().__init__(input_, None, str)
-
-    def is_blocked(self, position: Position) -> bool:
-        return self[position] == "#" if self.is_in_bounds(position) else False
-
-    def walk_until_exit(self) -> dict[Position, list[Direction]]:
+        self.start = Position(*np.argwhere(self.data == "^")[0])
+        self.rays = RayTable(
+            self.mask("#"), Position.directions(include_diagonal=False)
+        )
+
+    def walk_segments(
+        self, obstacle: Position | None = None
+    ) -> Generator[tuple[Position, Direction, int], None, None]:
         """
-        Walk the map until the guard would exit the map. Return the history of the guard's path
+        Walk the map until the guard would exit the map. Instead of stepping cell by
+        cell, the guard jumps to the next obstacle with the ray table.
         Raise InfiniteLoopError if the guard would loop
+
+        Args:
+            obstacle: An extra obstacle, on top of the ones on the map
+
+        Returns:
+            The straight walks of the guard, as (start, direction, number of steps)
         """
-        position = Position(*np.argwhere(self.data == "^")[0])
+        position = self.start
         direction = Directions.TOP.value
-        guard_history = defaultdict(set)
-        # Until the guard would exit the map in the next step
-        while self.is_in_bounds(position + direction):
-            guard_history[position].add(direction)
-            if self.is_blocked(position + direction):
-                direction = direction.turn_right()
-                continue
+        turns = set()
+        while True:
+            steps, blocked = self.rays.cast(position, direction)
+            if obstacle is not None:
+                # The obstacle blocks if it is on the ray, before the next obstacle
+                offset = obstacle - position
+                k = offset.i * direction.i + offset.j * direction.j
+                if (
+                    0 < k <= steps
+                    and offset.i == direction.i * k
+                    and offset.j == direction.j * k
+                ):
+                    steps, blocked = k, True
+            # Stop in front of the obstacle, or at the edge of the map
+            yield position, direction, steps - 1
+            if not blocked:
+                return
+            position += direction * (steps - 1)
+            direction = direction.turn_right()
             # Deja vu
-            if direction in guard_history[position + direction]:
+            if (position, direction) in turns:
                 raise InfiniteLoopError
-            position += direction
+            turns.add((position, direction))
 
+    def walk_until_exit(self) -> dict[Position, set[Direction]]:
+        """
+        Walk the map until the guard would exit the map. Return the history of the
+        guard's path: the directions each visited position was walked in
+        Raise InfiniteLoopError if the guard would loop
+        """
+        guard_history = defaultdict(set)
+        for start, direction, steps in self.walk_segments():
+            for k in range(steps + 1):
+                guard_history[start + direction * k].add(direction)
         return guard_history
 
 
@@ -80,17 +117,15 @@ class Puzzle6(PuzzleToSolve):
     def b(self, map_: Map) -> int:
         result = 0
         guard_history = map_.walk_until_exit()
-        start = Position(*np.argwhere(map_.data == "^")[0])
         for position in tqdm(guard_history.keys()):
-            if position == start:
+            if position == map_.start:
                 continue
-            map_[position] = "#"
             try:
-                map_.walk_until_exit()
+                # Only the turns are needed to detect a loop
+                for _ in map_.walk_segments(obstacle=position):
+                    pass
             except InfiniteLoopError:
                 result += 1
-            finally:
-                map_[position] = "."
         return result
 
 
@@ -1,7 +1,6 @@
-import numpy as np
-
 from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
-from adventofcode.helpers.base_matrix import BaseMatrix, Position
+from adventofcode.helpers.base_matrix import BaseMatrix
+from adventofcode.helpers.bit_grid import BitGrid
 
 
 class Puzzle4(PuzzleToSolve):
@@ -34,51 +33,31 @@ class Puzzle4(PuzzleToSolve):
     def test_answer_b(self) -> int:
         return 43
 
-    def parse_input(self, input_: str) -> BaseMatrix:
-        return BaseMatrix(input_, dtype=str, pad=None)
+    def parse_input(self, input_: str) -> BitGrid:
+        """Parse the rolls ("@") into a bit grid."""
+        return BitGrid.from_array(
+            BaseMatrix(input_, pad=None, byte_coded=True).mask("@")
+        )
 
-    def is_removable_roll(self, matrix: BaseMatrix, position) -> bool:
-        """A position is a removable roll if:
+    def removable_rolls(self, rolls: BitGrid) -> BitGrid:
+        """Find all removable rolls. A position is a removable roll if:
 
         - It is a roll ("@")
         - It has 3 or fewer adjacent rolls (including diagonals)
         """
-        return (
-            matrix[position] == "@"
-            and np.sum(
-                np.array(
-                    matrix.adjacent_values(
-                        position, include_axis=True, include_diagonal=True
-                    )
-                )
-                == "@"
-            )
-            <= 3
+        return rolls & ~rolls.neighbors_at_least(
+            4, include_axis=True, include_diagonal=True
         )
 
-    def removable_rolls(self, matrix: BaseMatrix) -> list[Position]:
-        """Find all removable rolls in the matrix."""
-        return [
-            position
-            for position in matrix.iter_topleft_to_bottomright()
-            if self.is_removable_roll(matrix, position)
-        ]
-
-    def a(self, input_: BaseMatrix) -> int:
+    def a(self, input_: BitGrid) -> int:
         """Count the number of removable rolls in the matrix."""
-        return len(self.removable_rolls(input_))
-
-    def remove_rolls(self, matrix: BaseMatrix, positions: list[Position]) -> BaseMatrix:
-        """Remove a list of rolls from the matrix."""
-        for position in positions:
-            matrix[position] = "."
-        return matrix
+        return self.removable_rolls(input_).count()
 
-    def b(self, input_: BaseMatrix) -> int:
+    def b(self, input_: BitGrid) -> int:
         """Remove rolls until no more removable rolls exist. Return the number of rolls removed."""
         rolls_removed = 0
-        while rolls_to_remove := len(self.removable_rolls(input_)):
-            input_ = self.remove_rolls(input_, self.removable_rolls(input_))
+        while rolls_to_remove := (removable := self.removable_rolls(input_)).count():
+            input_ = input_ & ~removable
             rolls_removed += rolls_to_remove
         return rolls_removed
 
@@ -1,4 +1,7 @@
+import numpy as np
+
 from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
+from adventofcode.helpers.interval_set import IntervalSet
 
 
 class Puzzle5(PuzzleToSolve):
@@ -43,24 +46,12 @@ class Puzzle5(PuzzleToSolve):
 
     def a(self, input_: tuple[list[tuple[int, int]], list[int]]):
         database, ingredients = input_
-        return sum(
-            1
-            for number in ingredients
-            if any(start <= number <= end for start, end in database)
-        )
+        fresh = IntervalSet.from_inclusive(database)
+        return int(np.count_nonzero(fresh.contains_many(ingredients)))
 
     def b(self, input_: tuple[list[tuple[int, int]], list[int]]):
-        database = sorted(input_[0])
-        merged: list[tuple[int, int]] = [database.pop(0)]
-        for start, end in database:
-            # if item is after last range, add new range
-            if merged[-1][1] < start - 1:
-                merged.append((start, end))
-            # It overlaps. Add it to the last range
-            else:
-                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
-        result = sum(end - start + 1 for start, end in merged)
-        return result
+        # Overlapping ranges are merged by the interval set
+        return IntervalSet.from_inclusive(input_[0]).size
 
 
 puzzle = Puzzle5()
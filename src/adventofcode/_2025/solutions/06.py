@@ -41,19 +41,18 @@ class Puzzle6(PuzzleToSolve):
     def _pad_columns(self, input_: str) -> str:
         """Pad the columns in the input so that all numbers have the same number of digits.
 
-        - Check each cell. If its a digit, continue
-        - Else, check if all cells in the column are space. If so, we are at a column
-            delimiter, so leave " "
-        - Else, at least one number is a digit, hence this cell should be padded
+        - Find all cells that are a space. Others are digits or operators
+        - Exclude columns in which all cells are space. These are column delimiters,
+            so leave " "
+        - In the remaining columns, at least one number has a digit, hence these cells
+            should be padded
         """
-        matrix = BaseMatrix(
-            input_,
-            None,
+        matrix = BaseMatrix(input_, None, byte_coded=True)
+        space = matrix.code(" ")
+        to_pad = matrix.positions_where(
+            lambda data: (data == space) & ~np.all(data == space, axis=0)
         )
-        for position in matrix.iter_topleft_to_bottomright():
-            if matrix[position] != " " or np.all(matrix.data[:, position.j] == " "):
-                continue
-            matrix[position] = self._PAD
+        matrix.data[to_pad] = matrix.code(self._PAD)
         return str(matrix)
 
     def parse_input(self, input_: str) -> BaseMatrix:
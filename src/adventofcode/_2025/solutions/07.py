@@ -46,11 +46,11 @@ class Puzzle7(PuzzleToSolve):
 
     @property
     def start(self) -> Position:
-        start = np.where(self.matrix.data == "S")
+        start = np.where(self.matrix.mask("S"))
         return Position(start[0][0], start[1][0])
 
     def parse_input(self, input_: str) -> BaseMatrix:
-        self.matrix = BaseMatrix(input_, pad=None)
+        self.matrix = BaseMatrix(input_, pad=None, byte_coded=True)
         return self.matrix
 
     def a(self, matrix: BaseMatrix) -> int:
@@ -1,7 +1,11 @@
 import itertools
 from math import prod
 
+import numpy as np
+
 from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
+from adventofcode.helpers.closest_pairs import closest_pairs
+from adventofcode.helpers.union_find import UnionFind
 
 
 class Puzzle8(PuzzleToSolve):
@@ -61,75 +65,33 @@ class Puzzle8(PuzzleToSolve):
             [tuple(map(int, line.split(","))) for line in input_.splitlines()]
         )  # type: ignore
 
-    def connect(
-        self,
-        circuits: list[list[tuple[int, int, int]]],
-        a: tuple[int, int, int],
-        b: tuple[int, int, int],
-    ):
-        """Connect two junction boxes into circuits."""
-        circuit_a = next(
-            (i for i, circuit in enumerate(circuits) if a in circuit), None
-        )
-        circuit_b = next(
-            (i for i, circuit in enumerate(circuits) if b in circuit), None
-        )
-        # Both unmatched, add new circuit
-        if circuit_a is None and circuit_b is None:
-            circuits.append([a, b])
-        # Add b to a's circuit
-        elif circuit_a is not None and circuit_b is None:
-            circuits[circuit_a].append(b)
-        # Add a to b's circuit
-        elif circuit_b is not None and circuit_a is None:
-            circuits[circuit_b].append(a)
-        # Both in some circuit
-        elif circuit_a is not None and circuit_b is not None:
-            # Not already in the same circuit: merge
-            if circuit_a != circuit_b:
-                circuits[circuit_a].extend(circuits[circuit_b])
-                del circuits[circuit_b]
-        else:
-            raise ValueError("Unexpected case in circuit finding")
+    def connect(self, circuits: UnionFind, a: int, b: int):
+        """Connect two junction boxes (by index) into circuits."""
+        circuits.union(a, b)
 
     def create_circuits_untill_max_circuits(
         self, junction_boxes: list[tuple[int, int, int]], num_connections: int
-    ) -> list[list[tuple[int, int, int]]]:
+    ) -> UnionFind:
         """Create circuits until the given number of connections is made.
 
         Args:
             junction_boxes: list of junction box coordinates
             num_connections: number of connections to make
         Returns:
-            list of circuits created
+            The circuits created, as disjoint sets of junction box indices
         """
-        distances = self.sort_on_distances(junction_boxes)
-        circuits: list[list[tuple[int, int, int]]] = []
-        num_connected = 0
-        for _, (a, b) in distances:
+        pairs = closest_pairs(np.array(junction_boxes))
+        circuits = UnionFind(len(junction_boxes))
+        # The stream of pairs is lazy, only the closest ones are computed
+        for _, a, b in itertools.islice(pairs, num_connections):
             self.connect(circuits, a, b)
-            num_connected += 1
-            if num_connected >= num_connections:
-                break
         return circuits
 
-    def distance(self, a: tuple[int, int, int], b: tuple[int, int, int]) -> int:
-        return abs(a[0] - b[0]) ** 2 + abs(a[1] - b[1]) ** 2 + abs(a[2] - b[2]) ** 2
-
-    def sort_on_distances(
-        self, points: list[tuple[int, int, int]]
-    ) -> list[tuple[int, tuple[tuple[int, int, int], tuple[int, int, int]]]]:
-        combinations = itertools.combinations(points, 2)
-        return sorted(
-            [(self.distance(a, b), (a, b)) for a, b in combinations], key=lambda x: x[0]
-        )
-
     def a(self, junction_boxes: list[tuple[int, int, int]], num_connections: int):
         circuits = self.create_circuits_untill_max_circuits(
             junction_boxes, num_connections
         )
-        circuits.sort(key=len, reverse=True)
-        return prod(len(circuit) for circuit in circuits[:3])
+        return prod(circuits.largest_sizes(3))
 
     def create_circuits_until_single_circuit(
         self, junction_boxes: list[tuple[int, int, int]]
@@ -141,12 +103,11 @@ class Puzzle8(PuzzleToSolve):
         Returns:
             The product of the X-coordinates of the last connected junction box before finish.
         """
-        distances = self.sort_on_distances(junction_boxes)
-        circuits: list[list[tuple[int, int, int]]] = []
-        for _, (a, b) in distances:
+        circuits = UnionFind(len(junction_boxes))
+        for _, a, b in closest_pairs(np.array(junction_boxes)):
             self.connect(circuits, a, b)
-            if len(circuits) == 1 and len(circuits[0]) == len(junction_boxes):
-                return a[0] * b[0]
+            if circuits.components == 1:
+                return junction_boxes[a][0] * junction_boxes[b][0]
         raise ValueError("Could not connect all junction boxes")
 
     def b(self, junction_boxes: list[tuple[int, int, int]]):
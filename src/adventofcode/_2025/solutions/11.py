@@ -2,6 +2,7 @@ from collections import defaultdict
 from typing import Generic, TypeVar
 
 from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
+from adventofcode.helpers.dag import count_paths
 
 T = TypeVar("T")
 
@@ -14,35 +15,22 @@ class Graph(Generic[T]):
         for device, connections in devices:
             self.nodes[device] = connections
 
-    def find_all_paths(
+    def count_paths(
         self,
         start: T,
         end: T,
-        visited: list[T] | None = None,
         visit_at_least: list[T] | None = None,
-    ) -> list[list[T]]:
-        """Find all paths from start to end node.
+    ) -> int:
+        """Count the paths from start to end node, without listing them.
 
         Args:
             start (T): The starting node.
             end (T): The ending node.
-            visited (list[T]): The current path.
+            visit_at_least (list[T]): The nodes each path should visit.
         Returns:
-            list[list[T]]: A list of all paths from start to end.
+            int: The number of paths from start to end that visit all of visit_at_least.
         """
-        visit_at_least = visit_at_least or []
-        visited = visited or []
-        if start == end:
-            return [visited + [end]]  # include end node in path
-        if start not in self.nodes:
-            return []
-        visited.append(start)
-        return [
-            path
-            for node in self.nodes[start]
-            for path in self.find_all_paths(node, end, visited.copy())
-            if all(v in path for v in visit_at_least)
-        ]
+        return count_paths(self.nodes, start, end, visit_at_least or [])
 
 
 class Puzzle11(PuzzleToSolve):
@@ -98,13 +86,10 @@ hhh: out"""
         ]
 
     def a(self, devices: list[tuple[str, list[str]]]) -> int:
-        return len(Graph(devices).find_all_paths("you", "out"))
+        return Graph(devices).count_paths("you", "out")
 
     def b(self, devices: list[tuple[str, list[str]]]) -> int:
-        # todo: this is too slow. need to prune early
-        return len(
-            Graph(devices).find_all_paths("svr", "out", visit_at_least=["fft", "dac"])
-        )
+        return Graph(devices).count_paths("svr", "out", visit_at_least=["fft", "dac"])
 
 
 puzzle = Puzzle11()
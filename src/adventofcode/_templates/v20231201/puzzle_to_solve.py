@@ -1,20 +1,36 @@
 from abc import ABC, abstractmethod
-from aocd.models import Puzzle
+from functools import cached_property
+from typing import TYPE_CHECKING
+from adventofcode.helpers.input_store import LocalPuzzle, create_puzzle
+from adventofcode.helpers.result_cache import CacheKey, ResultCache
 import datetime
+import time
+
+if TYPE_CHECKING:
+    from aocd.models import Puzzle
 
 class PuzzleToSolve(ABC):
     """
     Implement this class to solve a puzzle
+
+    Attributes:
+        use_result_cache: Skip solving a part if its answer for the same input and
+            source is cached
     """
-    puzzle: Puzzle
 
-    def __init__(self) -> None:
+    use_result_cache: bool = True
+
+    @cached_property
+    def puzzle(self) -> "Puzzle | LocalPuzzle":
         """
-        Upon init, set the puzzle. Year is _2022. Day is provided as class property
-        """        
-        self.puzzle = Puzzle(self.year, self.day)
-        super().__init__()
+        The puzzle backend (aocd or the local store). Created upon first use, such that
+        instantiating a puzzle has no side effects
+        """
+        return create_puzzle(self.year, self.day)
 
+    @cached_property
+    def result_cache(self) -> ResultCache:
+        return ResultCache()
 
     @property
     @classmethod
@@ -91,6 +107,7 @@ class PuzzleToSolve(ABC):
     def solve_exercise(self, name: str):
         """
         Solve an exercise:
+        - If the answer for the actual input and the current source is cached, submit it
         - Run the implementation, given the test input.
         - Assert that the answer to the test input is correct
         - Run the implementation, given the actual input
@@ -102,14 +119,20 @@ class PuzzleToSolve(ABC):
         """
         if name not in ['a', 'b']:
             raise ValueError(f'Cannot solve exercise {name}')
+        puzzle_input = self.puzzle.input_data
+        cache_key = CacheKey.for_puzzle(self, name, puzzle_input)
+        if self.use_result_cache and (cached := self.result_cache.get(cache_key)):
+            setattr(self.puzzle, f'answer_{name}', cached.answer)
+            return
         expected = getattr(self, f'test_answer_{name}')
         got = getattr(self, f'test_{name}')()
 
         if not expected == got:
             raise AssertionError(f'Cannot solve {name}: The test input answer is {expected}, while {name}() returned {got}')
 
-        puzzle_input = self.puzzle.input_data
+        start = time.perf_counter()
         answer = getattr(self, name)(puzzle_input)
+        self.result_cache.put(cache_key, answer, time.perf_counter() - start)
         setattr(self.puzzle, f'answer_{name}', answer)
 
 
@@ -1,22 +1,50 @@
+import copy
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
 
-from aocd.models import Puzzle
+import numpy as np
+
+from adventofcode.helpers.base_matrix import BaseMatrix
+from adventofcode.helpers.bit_grid import BitGrid
+from adventofcode.helpers.input_store import LocalPuzzle, create_puzzle
+from adventofcode.helpers.result_cache import CacheKey, ResultCache
+
+if TYPE_CHECKING:
+    from aocd.models import Puzzle
 
 
 class PuzzleToSolve(ABC):
     """
     Implement this class to solve a puzzle
+
+    Attributes:
+        use_result_cache: Skip solving a part if its answer for the same input and
+            source is cached
+        parse_once: Parse each input once, and give each part its own copy of the
+            parsed input (see copy_parsed_input). Parts may mutate their input, so they
+            never share one
     """
 
-    puzzle: Puzzle
+    use_result_cache: bool = True
+    parse_once: bool = False
 
-    def __init__(self) -> None:
+    @cached_property
+    def puzzle(self) -> "Puzzle | LocalPuzzle":
         """
-        Upon init, set the puzzle. Year is _2022. Day is provided as class property
+        The puzzle backend (aocd or the local store). Created upon first use, such that
+        instantiating a puzzle has no side effects
         """
-        self.puzzle = Puzzle(self.year, self.day)
-        super().__init__()
+        return create_puzzle(self.year, self.day)
+
+    @cached_property
+    def result_cache(self) -> ResultCache:
+        return ResultCache()
+
+    @cached_property
+    def _parsed_inputs(self) -> dict[str, Any]:
+        return {}
 
     @property
     @classmethod
@@ -94,17 +122,47 @@ class PuzzleToSolve(ABC):
         """
         pass
 
+    def copy_parsed_input(self, parsed: Any) -> Any:
+        """
+        Copy a parsed input, such that a part can mutate it without affecting the other
+        part. Grids only copy their cells: a BaseMatrix through its __copy__, and an
+        array through ndarray.copy. A BitGrid is immutable, hence shared. Anything else
+        is deep copied. Override this if the parsed input can be copied cheaper
+        """
+        if isinstance(parsed, BaseMatrix):
+            return copy.copy(parsed)
+        if isinstance(parsed, np.ndarray):
+            return parsed.copy()
+        if isinstance(parsed, BitGrid):
+            return parsed
+        return copy.deepcopy(parsed)
+
+    def parse_input_once(self, input_: str) -> Any:
+        """
+        Parse an input. If parse_once, the input is only parsed upon the first call, and
+        each call returns a copy of that result
+        """
+        if not self.parse_once:
+            return self.parse_input(input_)
+        if input_ not in self._parsed_inputs:
+            self._parsed_inputs[input_] = self.parse_input(input_)
+        return self.copy_parsed_input(self._parsed_inputs[input_])
+
     def test_a(self):
-        return self.a(self.parse_input(self.test_input), **self.extra_kwargs["a_test"])
+        return self.a(
+            self.parse_input_once(self.test_input), **self.extra_kwargs["a_test"]
+        )
 
     def test_b(self):
         return self.b(
-            self.parse_input(self.test_input_alternative), **self.extra_kwargs["b_test"]
+            self.parse_input_once(self.test_input_alternative),
+            **self.extra_kwargs["b_test"],
         )
 
     def solve_exercise(self, name: str):
         """
         Solve an exercise:
+        - If the answer for the actual input and the current source is cached, submit it
         - Run the implementation, given the test input.
         - Assert that the answer to the test input is correct
         - Run the implementation, given the actual input
@@ -116,6 +174,11 @@ class PuzzleToSolve(ABC):
         """
         if name not in ["a", "b"]:
             raise ValueError(f"Cannot solve exercise {name}")
+        input_data = self.puzzle.input_data
+        cache_key = CacheKey.for_puzzle(self, name, input_data)
+        if self.use_result_cache and (cached := self.result_cache.get(cache_key)):
+            setattr(self.puzzle, f"answer_{name}", cached.answer)
+            return
         expected = getattr(self, f"test_answer_{name}")
         got = getattr(self, f"test_{name}")()
 
@@ -123,8 +186,10 @@ class PuzzleToSolve(ABC):
             raise AssertionError(
                 f"Cannot solve {name}: The test input answer is {expected}, while {name}() returned {got}"
             )
-        puzzle_input = self.parse_input(self.puzzle.input_data)
+        puzzle_input = self.parse_input_once(input_data)
+        start = time.perf_counter()
         answer = getattr(self, name)(puzzle_input, **self.extra_kwargs[name])
+        self.result_cache.put(cache_key, answer, time.perf_counter() - start)
         setattr(self.puzzle, f"answer_{name}", answer)
 
     def solve(self):
@@ -1,11 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError, dataclass
 from enum import Enum
-from typing import Any, Generator, List, Tuple, Union
+from pathlib import Path
+from typing import Any, Callable, Generator, List, Tuple, Union
 
 import numpy as np
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     i: int
     j: int
@@ -29,62 +30,62 @@ class Position:
     ) -> List["Direction"]:
         """Get all possible directions.
 
+        The directions are shared, immutable instances from a precomputed table.
+
         Args:
             include_axis: Whether to include axis-aligned directions
             include_diagonal: Whether to include diagonal directions
 
         """
-        directions = []
-        if include_axis:
-            directions += [
-                Direction(0, 1),
-                Direction(1, 0),
-                Direction(0, -1),
-                Direction(-1, 0),
-            ]
-        if include_diagonal:
-            directions += [
-                Direction(1, 1),
-                Direction(1, -1),
-                Direction(-1, 1),
-                Direction(-1, -1),
-            ]
-        return directions
+        return list(_DIRECTIONS[include_axis, include_diagonal])
 
     def neighbors(
         self, *, include_axis: bool = True, include_diagonal: bool = True
     ) -> List["Position"]:
         """Get all neighboring positions."""
+        i, j = self.i, self.j
         return [
-            self + d
-            for d in self.directions(
-                include_axis=include_axis, include_diagonal=include_diagonal
-            )
+            Position(i + d.i, j + d.j)
+            for d in _DIRECTIONS[include_axis, include_diagonal]
         ]
 
     def __hash__(self):
-        return hash(self.tuple_)
+        return hash((self.i, self.j))
 
 
 class Direction(Position):
-    def __post_init__(self):
-        if abs(self.i) > 1 or abs(self.j) > 1:
-            raise ValueError("i and j cannot be greater than 1")
-        if self.i == 0 and self.j == 0:
-            raise ValueError("i and j cannot both be 0")
+    """
+    A step between cells, usually to one of the eight neighbors. Immutable, as the
+    precomputed tables share their instances: assigning i or j raises
+    FrozenInstanceError, like a frozen dataclass.
+    """
+
+    # No __dict__ either, the slots of Position suffice
+    __slots__ = ()
+
+    def __init__(self, i: int, j: int):
+        # Not validated: multiples of a direction (see __mul__) are directions too
+        object.__setattr__(self, "i", i)
+        object.__setattr__(self, "j", j)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __reduce__(self):
+        # Copies and pickles are constructed, instead of assigned slot by slot
+        return type(self), self.tuple_
 
     def turn_right(self) -> "Direction":
         """Get the direction after turning right 90 degrees."""
-        if abs(self.i) == abs(self.j):
+        try:
+            return _RIGHT_TURNS[self.i, self.j]
+        except KeyError as e:
             raise ValueError(
                 f"Can only turn on horizontal / vertical directions, not {self.tuple_}"
-            )
-        return {
-            (-1, 0): Direction(0, 1),
-            (0, 1): Direction(1, 0),
-            (1, 0): Direction(0, -1),
-            (0, -1): Direction(-1, 0),
-        }[self.tuple_]
+            ) from e
 
     def turn_left(self) -> "Direction":
         """Get the direction after turning left 90 degrees."""
@@ -92,12 +93,30 @@ class Direction(Position):
 
     def reverse(self) -> "Direction":
         """Get the direction after reversing 180 degrees."""
-        return Direction(-self.i, -self.j)
+        return _REVERSED[self.i, self.j]
 
     def __mul__(self, other: int) -> "Direction":
         return Direction(self.i * other, self.j * other)
 
 
+# Precomputed, such that the hot loops do not construct new directions
+_AXIS = (Direction(0, 1), Direction(1, 0), Direction(0, -1), Direction(-1, 0))
+_DIAGONAL = (Direction(1, 1), Direction(1, -1), Direction(-1, 1), Direction(-1, -1))
+_DIRECTIONS: dict[tuple[bool, bool], tuple[Direction, ...]] = {
+    (True, True): _AXIS + _DIAGONAL,
+    (True, False): _AXIS,
+    (False, True): _DIAGONAL,
+    (False, False): (),
+}
+_RIGHT_TURNS = {
+    (-1, 0): _AXIS[0],
+    (0, 1): _AXIS[1],
+    (1, 0): _AXIS[2],
+    (0, -1): _AXIS[3],
+}
+_REVERSED = {d.tuple_: Direction(-d.i, -d.j) for d in _AXIS + _DIAGONAL}
+
+
 class Directions(Enum):
     """Enum of static directions."""
 
@@ -109,40 +128,206 @@ class Directions(Enum):
     ALL = [TOP, RIGHT, BOTTOM, LEFT]
 
 
+# The symbol of each byte value, to decode byte-coded cells
+SYMBOLS = np.array([chr(code) for code in range(256)])
+
+
+def _find_newline(codes: np.ndarray, chunk_size: int = 2**20) -> int:
+    """The index of the first newline, -1 if none. Scans in chunks, such that a large
+    memory map is not read (or compared) as a whole."""
+    for start in range(0, len(codes), chunk_size):
+        index = codes[start : start + chunk_size].tobytes().find(b"\n")
+        if index != -1:
+            return start + index
+    return -1
+
+
+def parse_byte_grid(input_: str | bytes | Path) -> np.ndarray:
+    """Parse a grid of single byte characters into a uint8 array of byte values.
+
+    The buffer is viewed with the newlines as the stride between rows, such that no
+    copy is made besides the encoding of the input. A file is memory mapped
+    copy-on-write, such that it is not read into memory at once, nor changed on write.
+
+    Raises:
+        ValueError: If the lines do not all have the same length
+    """
+    if isinstance(input_, Path):
+        codes = np.memmap(input_, dtype=np.uint8, mode="c")
+    else:
+        buffer = bytearray(input_, "ascii") if isinstance(input_, str) else input_
+        codes = np.frombuffer(buffer, dtype=np.uint8)
+    if len(codes) and codes[-1] == ord("\n"):
+        codes = codes[:-1]
+    width = _find_newline(codes)
+    if width == -1:
+        width = len(codes)
+    height, remainder = divmod(len(codes) + 1, width + 1)
+    if remainder or np.any(codes[width :: width + 1] != ord("\n")):
+        raise ValueError("All lines of a grid must have the same length")
+    return np.lib.stride_tricks.as_strided(
+        codes, shape=(height, width), strides=(width + 1, 1)
+    )
+
+
+@dataclass
+class Regions:
+    """Connected regions of a grid, and their statistics.
+
+    Attributes:
+        labels: The region of each cell, numbered from 0 in order of first occurrence
+            (top left to bottom right). -1 for excluded cells
+        areas: The number of cells of each region
+        perimeters: The number of cell edges on the boundary of each region
+        sides: The number of straight sides of the boundary of each region
+    """
+
+    labels: np.ndarray
+    areas: np.ndarray
+    perimeters: np.ndarray
+    sides: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.areas)
+
+
+def _shifted(padded: np.ndarray, di: int, dj: int) -> np.ndarray:
+    """View a 1-padded array such that each cell holds the value of its (di, dj) neighbor."""
+    rows, columns = padded.shape[0] - 2, padded.shape[1] - 2
+    return padded[1 + di : rows + 1 + di, 1 + dj : columns + 1 + dj]
+
+
+def _connected_components(num_nodes: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Label the connected components of a graph given by edges (u[k], v[k]).
+
+    Vectorized label propagation: the root of each edge endpoint is hooked onto the
+    smaller root, then all paths are compressed by pointer jumping, until no edge
+    connects two roots. Returns the smallest node of the component of each node.
+    """
+    parent = np.arange(num_nodes)
+    while True:
+        root_u, root_v = parent[u], parent[v]
+        differs = root_u != root_v
+        if not differs.any():
+            return parent
+        low = np.minimum(root_u[differs], root_v[differs])
+        high = np.maximum(root_u[differs], root_v[differs])
+        np.minimum.at(parent, high, low)
+        while not np.array_equal(grandparent := parent[parent], parent):
+            parent = grandparent
+
+
+def label_regions(
+    values: np.ndarray, include: np.ndarray | None = None, by_value: bool = True
+) -> Regions:
+    """Find the connected regions (horizontally and vertically) of a grid.
+
+    Args:
+        values: The grid
+        include: If provided, only the cells in this boolean array are part of a region
+        by_value: If True, connected cells are in the same region if their values are
+            equal. If False, all connected cells that are included form one region
+    """
+    values = np.asarray(values)
+    if include is None:
+        include = np.ones(values.shape, dtype=bool)
+    include = np.asarray(include)
+    index = np.arange(values.size).reshape(values.shape)
+    # Pairs of horizontally and vertically adjacent cells that are in the same region
+    us, vs = [], []
+    for a, b in [(np.s_[:, :-1], np.s_[:, 1:]), (np.s_[:-1, :], np.s_[1:, :])]:
+        same = include[a] & include[b]
+        if by_value:
+            same &= values[a] == values[b]
+        us.append(index[a][same])
+        vs.append(index[b][same])
+    roots = _connected_components(values.size, np.concatenate(us), np.concatenate(vs))
+    # Number the regions 0..k-1 in order of their root, which is their first cell
+    roots = np.where(include.ravel(), roots, -1)
+    region_roots, labels = np.unique(roots, return_inverse=True)
+    if len(region_roots) and region_roots[0] == -1:
+        labels -= 1
+    labels = labels.reshape(values.shape)
+    num_regions = int(labels.max()) + 1 if labels.size else 0
+
+    def count(cells: np.ndarray) -> np.ndarray:
+        return np.bincount(labels[cells], minlength=num_regions)
+
+    padded = np.pad(labels, 1, constant_values=-1)
+    perimeters = np.zeros(num_regions, dtype=int)
+    sides = np.zeros(num_regions, dtype=int)
+    for d in _AXIS:
+        boundary = (labels >= 0) & (_shifted(padded, d.i, d.j) != labels)
+        perimeters += count(boundary)
+        # A side starts at a boundary cell whose neighbor along the side (turning
+        # right) is not on the same side
+        along = d.turn_right()
+        continues = (_shifted(padded, along.i, along.j) == labels) & _shifted(
+            np.pad(boundary, 1), along.i, along.j
+        )
+        sides += count(boundary & ~continues)
+    return Regions(labels, count(labels >= 0), perimeters, sides)
+
+
 class BaseMatrix:
     """
     Matrix class, to be used as a base class for other matrix classes
     Parses input into a numpy matrix, and provides some helper functions
 
     Attributes:
-        data: the numpy matrix
+        data: the numpy matrix. If byte coded, a uint8 ndarray of the byte values of
+            the cells instead
         pad: the padding used to surround the matrix
+        byte_coded: whether the cells are stored as byte values
     """
 
-    data: np.matrix
+    data: np.matrix | np.ndarray
     pad: str
-    input_: str
+    input_: str | Path
     dtype: type
+    byte_coded: bool
 
     def __init__(
         self,
-        input_: str,
+        input_: str | Path,
         pad: str | None = ".",
         dtype: type = str,
         split_columns_on: str | None = None,
+        byte_coded: bool = False,
     ):
         """Parse the input into a numpy matrix.
 
         Args:
-            input_: The input string to parse
+            input_: The input string to parse, or the path to a file with the input. A
+                file is memory mapped, without ever holding its lines in memory. With
+                byte_coded and no pad, the cells are not even copied
             pad: The padding character to use (default: "."). If None, no padding is applied.
             dtype: The data type of the matrix (default: str)
             split_columns_on: The character to split columns on. If None, each cell is 1 character.
                 If provided, each cell could be multiple characters. In this case
+            byte_coded: Store the cells as their byte values in a uint8 ndarray, built
+                directly from the input bytes. Indexing with a position still returns
+                the symbol, compare data with code(symbol) or use mask(symbol). Only
+                for grids of single ASCII characters. If False (default), data is an
+                np.matrix of dtype, for compatibility
         """
         self.input_ = input_
         self.pad = pad
         self.dtype = dtype
+        self.byte_coded = byte_coded
+        if byte_coded or isinstance(input_, Path):
+            if split_columns_on is not None:
+                raise ValueError("Matrices from bytes have one character per cell")
+            self.data = parse_byte_grid(input_)
+            if not byte_coded:
+                # Convert the bytes to the cell type directly, without lists of lines
+                cells = SYMBOLS[self.data] if dtype is str else self.data.view("S1")
+                self.data = np.asmatrix(cells.astype(dtype, copy=False))
+            if pad is not None:
+                self.data = np.pad(
+                    self.data, 1, constant_values=self.code(pad) if byte_coded else pad
+                )
+            return
         # Do not split, assume each cell has one character
         if split_columns_on is None:
             self.data = np.matrix(
@@ -160,7 +345,9 @@ class BaseMatrix:
 
     def __getitem__(self, item: Tuple[int, int] | Position) -> str:
         if isinstance(item, Position):
-            return self.data[item.i, item.j]
+            item = item.i, item.j
+        if self.byte_coded:
+            return SYMBOLS[self.data[item]]
         return self.data[item]
 
     def __setitem__(self, key: tuple[int, int] | Position, value: Any) -> None:
@@ -168,7 +355,17 @@ class BaseMatrix:
             key = key.tuple_
         if not self.is_in_bounds(Position(*key)):
             raise ValueError(f"Index {key} is out of bounds")
-        self.data[key] = value
+        self.data[key] = self.code(value) if self.byte_coded else value
+
+    def code(self, symbol: str) -> int:
+        """The byte value a symbol is stored as, if the matrix is byte coded."""
+        return ord(symbol)
+
+    def mask(self, value: Any) -> np.ndarray:
+        """Get a boolean ndarray of the cells that equal a value."""
+        if self.byte_coded:
+            return self.data == self.code(value)
+        return np.asarray(self.data == value)
 
     def is_in_bounds(self, position: Position | tuple[int, int]) -> bool:
         """Check if a position is in bounds of the matrix (excluding padding)."""
@@ -179,11 +376,10 @@ class BaseMatrix:
     def iter_topleft_to_bottomright(self) -> Generator[Position, None, None]:
         """Yield all indices from top left to bottom right. Do not iterate of the pad."""
         start_at = 1 if self.pad is not None else 0
-        yield from [
-            Position(i, j)
-            for i in range(start_at, self.data.shape[0] - (start_at))
-            for j in range(start_at, self.data.shape[1] - (start_at))
-        ]
+        columns = range(start_at, self.data.shape[1] - (start_at))
+        for i in range(start_at, self.data.shape[0] - (start_at)):
+            for j in columns:
+                yield Position(i, j)
 
     def adjacent_fields(
         self,
@@ -199,13 +395,34 @@ class BaseMatrix:
             include_axis: Whether to include axis-aligned directions
             include_diagonal: Whether to include diagonal directions
         """
-        yield from [
-            field + d
-            for d in Position.directions(
-                include_axis=include_axis, include_diagonal=include_diagonal
-            )
-            if self.is_in_bounds(field + d)
-        ]
+        rows, columns = self.data.shape
+        i, j = field.i, field.j
+        for d in _DIRECTIONS[include_axis, include_diagonal]:
+            if 0 <= i + d.i < rows and 0 <= j + d.j < columns:
+                yield Position(i + d.i, j + d.j)
+
+    def positions_where(
+        self, predicate_or_value: Callable[[np.ndarray], np.ndarray] | Any
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the positions of all cells that match, without iterating over them.
+
+        Args:
+            predicate_or_value: A value to compare the cells with (see mask()), or a
+                function that maps the data to a boolean array of the same shape
+
+        Returns:
+            The row and column indices of the matches, ordered from top left to bottom
+            right, like np.nonzero. Can be used to index data directly. The pad is
+            excluded
+        """
+        if callable(predicate_or_value):
+            mask = np.array(predicate_or_value(self.data), dtype=bool)
+        else:
+            mask = self.mask(predicate_or_value)
+        if self.pad is not None:
+            mask[[0, -1], :] = False
+            mask[:, [0, -1]] = False
+        return np.nonzero(mask)
 
     def adjacent_values(
         self,
@@ -228,6 +445,55 @@ class BaseMatrix:
             )
         ]
 
+    def neighbor_counts(
+        self,
+        value: Any,
+        *,
+        include_axis: bool = True,
+        include_diagonal: bool = True,
+    ) -> np.ndarray:
+        """Count for each cell how many of its adjacent cells equal a value.
+
+        Computed for the whole matrix at once, by summing shifted copies of the mask of
+        the value. Cells outside the matrix do not count.
+
+        Args:
+            value: The value to count
+            include_axis: Whether to include axis-aligned directions
+            include_diagonal: Whether to include diagonal directions
+
+        Returns:
+            An array of the shape of the matrix (including padding)
+        """
+        rows, columns = self.data.shape
+        mask = np.pad(self.mask(value).astype(np.uint8), 1)
+        counts = np.zeros((rows, columns), dtype=np.uint8)
+        for d in _DIRECTIONS[include_axis, include_diagonal]:
+            counts += mask[1 + d.i : rows + 1 + d.i, 1 + d.j : columns + 1 + d.j]
+        return counts
+
+    def label_regions(
+        self, include: np.ndarray | None = None, by_value: bool = True
+    ) -> Regions:
+        """Find the connected regions of the matrix, and their area, perimeter and number
+        of sides. The pad is excluded.
+
+        Args:
+            include: If provided, only the cells in this boolean array are part of a
+                region
+            by_value: If True, connected cells are in the same region if their values
+                are equal. If False, all connected cells that are included form one
+                region
+        """
+        if self.pad is not None:
+            include = (
+                np.ones(self.data.shape, dtype=bool) if include is None else include
+            )
+            include = include.copy()
+            include[[0, -1], :] = False
+            include[:, [0, -1]] = False
+        return label_regions(self.data, include, by_value)
+
     @property
     def rows(self) -> Generator[np.matrix, None, None]:
         """Yield all rows of the matrix."""
@@ -245,7 +511,13 @@ class BaseMatrix:
         return "\n".join(["".join([str(x) for x in line]) for line in np.array(matrix)])
 
     def __repr__(self):
+        if self.byte_coded:
+            return "\n".join(row.tobytes().decode("ascii") for row in self.data)
         return self.matrix_to_str(self.data)
 
     def __copy__(self):
-        return BaseMatrix(self.input_, pad=self.pad, dtype=self.dtype)
+        """Copy the cells, instead of parsing the input again."""
+        copy = object.__new__(type(self))
+        copy.__dict__.update(self.__dict__)
+        copy.data = self.data.copy()
+        return copy
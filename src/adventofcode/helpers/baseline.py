@@ -0,0 +1,204 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+# The metrics that are compared, and the unit to display them in
+METRICS = {"median": ("ms", 1000), "peak_bytes": ("MiB", 1 / 2**20)}
+# Differences below these are noise, and never count as regression. Small, such that
+# regressions of stages that take microseconds, like on the test inputs, are caught
+MIN_DIFFERENCE = {"median": 10e-6, "peak_bytes": 2**10}
+# A median is only slower if it differs by more than this many times the spread
+# (interquartile range) of the times, of the baseline or the current run
+NOISE_SPREADS = 2
+
+
+@dataclass
+class Comparison:
+    """A metric of one stage of one day, in the baseline and in the current run.
+
+    Attributes:
+        noise: Differences up to this are noise, never a regression. Scales with the
+            spread of the measured times
+        speed: How much slower the machine runs than for the baseline (see
+            machine_speed). Times are compared to the baseline times multiplied by this
+    """
+
+    key: str
+    stage: str
+    metric: str
+    baseline: float
+    current: float
+    noise: float = 0
+    speed: float = 1
+
+    @property
+    def expected(self) -> float:
+        """The baseline, corrected for the speed of the machine."""
+        return self.baseline * self.speed if self.metric == "median" else self.baseline
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.expected if self.expected else float("inf")
+
+    def is_regression(self, threshold: float) -> bool:
+        """Whether current is more than threshold (eg 0.2 for 20%) worse than expected,
+        by more than the noise."""
+        return self.ratio > 1 + threshold and self.current - self.expected > self.noise
+
+    def format(self, threshold: float) -> str:
+        unit, factor = METRICS[self.metric]
+        flag = "REGRESSION" if self.is_regression(threshold) else ""
+        return (
+            f"{self.key} {self.stage:<12} {self.metric:<10} "
+            f"{self.expected * factor:12.2f}{unit:>4} -> {self.current * factor:12.2f}"
+            f"{unit:>4} {self.ratio:7.2f}x {flag}"
+        )
+
+
+def round_speeds(results: dict) -> np.ndarray | None:
+    """The speed of the machine in each round of a bench run (see benchmark_rounds):
+    the median over all stages of their time in that round, relative to their median
+    time. None if the stages do not have a time for every round."""
+    times = [
+        stats["times"]
+        for stages in results.values()
+        if "error" not in stages
+        for stats in stages.values()
+        if stats["median"] > MIN_DIFFERENCE["median"]
+    ]
+    if not times or len({len(stage_times) for stage_times in times}) > 1:
+        return None
+    times = np.array(times)
+    return np.median(times / np.median(times, axis=1, keepdims=True), axis=0)
+
+
+def steady_results(results: dict) -> dict:
+    """The bench results, with the median and spread of each stage computed from its
+    times in each round divided by the speed of the machine in that round. This
+    removes most of the noise of a machine that changes speed during the run."""
+    speeds = round_speeds(results)
+    if speeds is None:
+        return results
+    steady = {}
+    for key, stages in results.items():
+        if "error" in stages:
+            steady[key] = stages
+            continue
+        steady[key] = {}
+        for stage, stats in stages.items():
+            times = np.array(stats["times"]) / speeds
+            steady[key][stage] = {
+                **stats,
+                "median": float(np.median(times)),
+                "spread": float(np.subtract(*np.percentile(times, [75, 25]))),
+            }
+    return steady
+
+
+def save_baseline(path: Path, results: dict, use_test_input: bool) -> dict[str, str]:
+    """Write bench results as baseline, corrected for the speed of the machine in each
+    round. Days that failed are left out, and listed with their error under
+    "excluded".
+
+    Returns:
+        The error of each day that was left out
+    """
+    excluded = {
+        key: stages["error"] for key, stages in results.items() if "error" in stages
+    }
+    results = steady_results(results)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "use_test_input": use_test_input,
+                "results": {
+                    key: {
+                        stage: {
+                            metric: stats[metric] for metric in [*METRICS, "spread"]
+                        }
+                        for stage, stats in stages.items()
+                    }
+                    for key, stages in results.items()
+                    if key not in excluded
+                },
+                "excluded": excluded,
+            },
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+    return excluded
+
+
+def load_baseline(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def noise_level(metric: str, baseline: dict, current: dict) -> float:
+    """The difference in a metric that is still noise, for one stage."""
+    if metric != "median":
+        return MIN_DIFFERENCE[metric]
+    spread = max(baseline.get("spread", 0), current.get("spread", 0))
+    return max(MIN_DIFFERENCE[metric], NOISE_SPREADS * spread)
+
+
+def _compared_stages(results: dict, baseline: dict):
+    """The (key, stage, baseline stats, current stats) of the stages in both."""
+    for key, stages in results.items():
+        if "error" in stages or key not in baseline["results"]:
+            continue
+        for stage, stats in stages.items():
+            yield key, stage, baseline["results"][key].get(stage, {}), stats
+
+
+def machine_speed(results: dict, baseline: dict) -> float:
+    """How much slower the machine runs than when the baseline was made: the median
+    ratio of the median times of all stages. A regression of a few stages barely moves
+    it, while a slower or busier machine slows down all stages alike."""
+    ratios = [
+        stats["median"] / before["median"]
+        for _, _, before, stats in _compared_stages(results, baseline)
+        if before.get("median") and stats.get("median") is not None
+    ]
+    return float(np.median(ratios)) if ratios else 1.0
+
+
+def compare_to_baseline(results: dict, baseline: dict) -> list[Comparison]:
+    """Compare bench results to a baseline, for all days and stages in both. Times
+    are corrected for the speed of the machine."""
+    results = steady_results(results)
+    speed = machine_speed(results, baseline)
+    comparisons = []
+    for key, stage, before, stats in _compared_stages(results, baseline):
+        for metric in METRICS:
+            if before.get(metric) is None or stats.get(metric) is None:
+                continue
+            comparisons.append(
+                Comparison(
+                    key,
+                    stage,
+                    metric,
+                    before[metric],
+                    stats[metric],
+                    noise_level(metric, before, stats),
+                    speed,
+                )
+            )
+    return comparisons
+
+
+def not_compared(results: dict, baseline: dict) -> dict[str, str]:
+    """The days of the results that cannot be compared to the baseline, and why."""
+    reasons = {}
+    for key, stages in results.items():
+        if "error" in stages:
+            reasons[key] = f"fails now: {stages['error']}"
+        elif key in baseline.get("excluded", {}):
+            reasons[key] = f"failed in the baseline: {baseline['excluded'][key]}"
+        elif key not in baseline["results"]:
+            reasons[key] = "not in the baseline"
+    return reasons
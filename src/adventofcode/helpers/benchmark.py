@@ -0,0 +1,247 @@
+import os
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import numpy as np
+
+from adventofcode.helpers.generators import generate_input
+from adventofcode.helpers.limits import TaskTimeoutError, time_limit
+
+STAGES = ("parse_input", "a", "b")
+# Parts with a fitted growth exponent of at least this are flagged as quadratic or worse
+QUADRATIC_EXPONENT = 1.8
+
+
+@dataclass
+class StageTimings:
+    """Wall times (in seconds) of repeated runs of one stage of a puzzle, and the peak
+    memory (in bytes) allocated during a separate run, if measured."""
+
+    stage: str
+    times: list[float] = field(default_factory=list)
+    peak_bytes: int | None = None
+
+    @property
+    def median(self) -> float:
+        return float(np.median(self.times))
+
+    @property
+    def p95(self) -> float:
+        return float(np.percentile(self.times, 95))
+
+    @property
+    def min(self) -> float:
+        return float(np.min(self.times))
+
+    @property
+    def spread(self) -> float:
+        """The interquartile range of the times, a measure of their noise."""
+        return float(np.subtract(*np.percentile(self.times, [75, 25])))
+
+    def as_dict(self) -> dict:
+        return {
+            "median": self.median,
+            "p95": self.p95,
+            "min": self.min,
+            "spread": self.spread,
+            "peak_bytes": self.peak_bytes,
+            "times": self.times,
+        }
+
+
+def timed(function: Callable, *args, **kwargs) -> tuple[Any, float]:
+    """Run a function, return its result and the wall time it took."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def peak_memory(function: Callable, *args, **kwargs) -> tuple[Any, int]:
+    """Run a function, return its result and the peak memory it allocated, in bytes.
+
+    Measured with tracemalloc, which also tracks numpy allocations. Tracing slows the
+    function down, so do not combine this with timing.
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def puzzle_inputs(puzzle, use_test_input: bool) -> dict[str, tuple[str, dict]]:
+    """Get the raw input and the extra kwargs for both parts of a puzzle.
+
+    Args:
+        puzzle: The PuzzleToSolve instance
+        use_test_input: Use the test inputs of the puzzle description instead of
+            the actual input
+    """
+    extra_kwargs = getattr(
+        puzzle, "extra_kwargs", {"a_test": {}, "b_test": {}, "a": {}, "b": {}}
+    )
+    if use_test_input:
+        return {
+            "a": (puzzle.test_input, extra_kwargs["a_test"]),
+            "b": (puzzle.test_input_alternative, extra_kwargs["b_test"]),
+        }
+    input_data = puzzle.puzzle.input_data
+    return {"a": (input_data, extra_kwargs["a"]), "b": (input_data, extra_kwargs["b"])}
+
+
+def benchmark_puzzle(
+    puzzle,
+    repeats: int = 5,
+    use_test_input: bool = False,
+    measure_memory: bool = False,
+) -> dict[str, StageTimings]:
+    """Time parse_input, a and b of a puzzle separately.
+
+    Each repeat parses the input anew for each part, since several solutions
+    mutate their parsed input. Only the parsing for part a is timed as the
+    parse_input stage.
+
+    Args:
+        puzzle: The PuzzleToSolve instance
+        repeats: The number of times to run each stage
+        use_test_input: Use the test inputs instead of the actual input
+        measure_memory: Run each stage once more, to measure its peak memory
+    """
+    # The oldest template has no parse_input, its parts receive the raw string
+    parse_input = getattr(puzzle, "parse_input", lambda input_: input_)
+    inputs = puzzle_inputs(puzzle, use_test_input)
+    timings = {stage: StageTimings(stage) for stage in STAGES}
+    for _ in range(repeats):
+        for part in ["a", "b"]:
+            raw, kwargs = inputs[part]
+            parsed, parse_time = timed(parse_input, raw)
+            if part == "a":
+                timings["parse_input"].times.append(parse_time)
+            _, part_time = timed(getattr(puzzle, part), parsed, **kwargs)
+            timings[part].times.append(part_time)
+    if measure_memory:
+        for part in ["a", "b"]:
+            raw, kwargs = inputs[part]
+            parsed, parse_peak = peak_memory(parse_input, raw)
+            if part == "a":
+                timings["parse_input"].peak_bytes = parse_peak
+            _, timings[part].peak_bytes = peak_memory(
+                getattr(puzzle, part), parsed, **kwargs
+            )
+    return timings
+
+
+def benchmark_rounds(
+    puzzles: dict[str, Any],
+    repeats: int = 5,
+    use_test_input: bool = False,
+    measure_memory: bool = False,
+) -> dict[str, dict[str, StageTimings] | Exception]:
+    """Time parse_input, a and b of several puzzles, in rounds: each round runs every
+    stage of every puzzle once. Unlike all repeats of one puzzle after the other, a
+    machine that changes speed during the run then slows down all stages alike, such
+    that it can be corrected for when comparing to a baseline.
+
+    Args:
+        puzzles: The PuzzleToSolve instances, by key
+        repeats: The number of rounds
+        use_test_input: Use the test inputs instead of the actual inputs
+        measure_memory: Measure the peak memory of each stage, in the last round
+
+    Returns:
+        The timings of each puzzle, or the exception it raised
+    """
+    results: dict[str, dict[str, StageTimings] | Exception] = {}
+    for round_ in range(repeats):
+        for key, puzzle in puzzles.items():
+            if isinstance(results.get(key), Exception):
+                continue
+            try:
+                timings = benchmark_puzzle(
+                    puzzle, 1, use_test_input, measure_memory and round_ == repeats - 1
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                results[key] = e
+                continue
+            if key not in results:
+                results[key] = timings
+                continue
+            for stage, stage_timings in timings.items():
+                results[key][stage].times.extend(stage_timings.times)
+                if stage_timings.peak_bytes is not None:
+                    results[key][stage].peak_bytes = stage_timings.peak_bytes
+    return results
+
+
+@dataclass
+class ScalingPoint:
+    """The minimal wall time of each stage at one input scale.
+
+    Attributes:
+        scale: The multiplier on the number of elements of the base input
+        size: The size of the generated input, in characters
+        seconds: Stage to its minimal wall time. Missing if the stage exceeded the budget
+    """
+
+    scale: float
+    size: int
+    seconds: dict[str, float] = field(default_factory=dict)
+
+
+def growth_exponent(sizes: list[int], seconds: list[float]) -> float:
+    """Fit seconds = c * size^k on a log-log scale, and return k."""
+    return float(np.polyfit(np.log(sizes), np.log(seconds), 1)[0])
+
+
+def scaling_curve(
+    puzzle,
+    scales: list[float],
+    repeats: int = 1,
+    max_seconds: float | None = None,
+) -> list[ScalingPoint]:
+    """Time each stage of a puzzle on synthetic inputs of increasing scale.
+
+    A stage that exceeds max_seconds is aborted, and is not run on larger scales. The
+    output the solutions print is discarded, as it would dominate the timings.
+
+    Args:
+        puzzle: The PuzzleToSolve instance. Needs a generator in GENERATORS
+        scales: The scales to generate inputs for, in increasing order
+        repeats: The number of runs per stage, per scale. The minimal time is used
+        max_seconds: The time budget for a single run of a stage
+    """
+    parse_input = getattr(puzzle, "parse_input", lambda input_: input_)
+    extra_kwargs = getattr(puzzle, "extra_kwargs", {"a": {}, "b": {}})
+    exceeded: set[str] = set()
+    points = []
+    for scale in scales:
+        raw = generate_input(puzzle.year, puzzle.day, scale)
+        point = ScalingPoint(scale, len(raw))
+        for stage in [stage for stage in STAGES if stage not in exceeded]:
+            times = []
+            try:
+                for _ in range(repeats):
+                    with time_limit(max_seconds), open(
+                        os.devnull, "w", encoding="utf-8"
+                    ) as devnull, redirect_stdout(devnull):
+                        if stage == "parse_input":
+                            _, seconds = timed(parse_input, raw)
+                        else:
+                            parsed = parse_input(raw)
+                            _, seconds = timed(
+                                getattr(puzzle, stage), parsed, **extra_kwargs[stage]
+                            )
+                    times.append(seconds)
+                point.seconds[stage] = min(times)
+            except TaskTimeoutError:
+                exceeded.add(stage)
+        points.append(point)
+        # Without a parsed input, the parts cannot run either
+        if "parse_input" in exceeded:
+            break
+    return points
@@ -0,0 +1,160 @@
+from functools import lru_cache
+
+import numpy as np
+
+from adventofcode.helpers.base_matrix import Position
+
+
+@lru_cache(maxsize=None)
+def _full(height: int, width: int) -> int:
+    """The bits of all cells of a grid, without the guard bits."""
+    stride = width + 1
+    row = (1 << width) - 1
+    # Repeat the row for each stride, by multiplying with 1 + 2^stride + 2^2stride...
+    return row * (((1 << (stride * height)) - 1) // ((1 << stride) - 1))
+
+
+class BitGrid:
+    """
+    A grid of booleans, packed into a single Python int. Cell (i, j) is bit
+    i * stride + j, where stride = width + 1: each row is followed by an always-zero
+    guard bit, such that horizontal shifts do not wrap into the next row. The whole
+    grid is updated in a handful of big-int operations, at one bit per cell.
+
+    Attributes:
+        bits: The packed cells
+        height: The number of rows
+        width: The number of columns
+    """
+
+    bits: int
+    height: int
+    width: int
+
+    def __init__(self, bits: int, height: int, width: int):
+        self.height = height
+        self.width = width
+        self.bits = bits & self.full
+
+    @property
+    def stride(self) -> int:
+        return self.width + 1
+
+    @property
+    def full(self) -> int:
+        """The bits of all cells, without the guard bits."""
+        return _full(self.height, self.width)
+
+    @classmethod
+    def from_array(cls, mask: np.ndarray) -> "BitGrid":
+        """Pack a 2D boolean array."""
+        mask = np.asarray(mask, dtype=bool)
+        height, width = mask.shape
+        guarded = np.pad(mask, ((0, 0), (0, 1)))
+        packed = np.packbits(guarded.ravel(), bitorder="little")
+        return cls(int.from_bytes(packed.tobytes(), "little"), height, width)
+
+    def to_array(self) -> np.ndarray:
+        """Unpack into a 2D boolean array."""
+        size = self.height * self.stride
+        packed = np.frombuffer(self.bits.to_bytes((size + 7) // 8, "little"), np.uint8)
+        bits = np.unpackbits(packed, count=size, bitorder="little")
+        return bits.reshape(self.height, self.stride)[:, : self.width].astype(bool)
+
+    def _new(self, bits: int) -> "BitGrid":
+        return BitGrid(bits, self.height, self.width)
+
+    def shift(self, di: int, dj: int) -> "BitGrid":
+        """Move all cells by (di, dj). Cells moved outside the grid are dropped."""
+        offset = di * self.stride + dj
+        return self._new(self.bits << offset if offset >= 0 else self.bits >> -offset)
+
+    def __and__(self, other: "BitGrid") -> "BitGrid":
+        return self._new(self.bits & other.bits)
+
+    def __or__(self, other: "BitGrid") -> "BitGrid":
+        return self._new(self.bits | other.bits)
+
+    def __xor__(self, other: "BitGrid") -> "BitGrid":
+        return self._new(self.bits ^ other.bits)
+
+    def __invert__(self) -> "BitGrid":
+        return self._new(~self.bits)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BitGrid) and self.bits == other.bits
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __getitem__(self, position: Position | tuple[int, int]) -> bool:
+        i, j = position.tuple_ if isinstance(position, Position) else position
+        return bool(self.bits >> (i * self.stride + j) & 1)
+
+    def count(self) -> int:
+        """The number of set cells."""
+        return self.bits.bit_count()
+
+    def neighbor_count_planes(
+        self, *, include_axis: bool = True, include_diagonal: bool = True
+    ) -> list["BitGrid"]:
+        """Count the set neighbors of each cell, as a bit-sliced number.
+
+        The shifted grids are added with ripple-carry adders on whole grids at once.
+
+        Returns:
+            The bit planes of the counts, least significant first: the count of a cell
+            is sum(plane[cell] << k for k, plane in enumerate(planes))
+        """
+        planes: list[int] = []
+        for d in Position.directions(
+            include_axis=include_axis, include_diagonal=include_diagonal
+        ):
+            # The neighbor in direction d moves onto the cell
+            carry = self.shift(-d.i, -d.j).bits
+            for k, plane in enumerate(planes):
+                planes[k], carry = plane ^ carry, plane & carry
+                if not carry:
+                    break
+            if carry:
+                planes.append(carry)
+        return [self._new(plane) for plane in planes]
+
+    def neighbor_counts(
+        self, *, include_axis: bool = True, include_diagonal: bool = True
+    ) -> np.ndarray:
+        """Count the set neighbors of each cell, as a 2D array."""
+        planes = self.neighbor_count_planes(
+            include_axis=include_axis, include_diagonal=include_diagonal
+        )
+        counts = np.zeros((self.height, self.width), dtype=np.uint8)
+        for k, plane in enumerate(planes):
+            counts += plane.to_array().astype(np.uint8) << k
+        return counts
+
+    def neighbors_at_least(
+        self,
+        value: int,
+        *,
+        include_axis: bool = True,
+        include_diagonal: bool = True,
+    ) -> "BitGrid":
+        """The cells with at least value set neighbors.
+
+        Compares the bit-sliced counts of all cells at once, from the least significant
+        bit up: a count is at least value if its bit is greater, or if its bit is equal
+        and its lower bits are at least those of value.
+        """
+        planes = self.neighbor_count_planes(
+            include_axis=include_axis, include_diagonal=include_diagonal
+        )
+        result = self.full
+        for k in range(max(len(planes), value.bit_length())):
+            plane = planes[k].bits if k < len(planes) else 0
+            result = plane & result if value >> k & 1 else plane | result
+        return self._new(result)
+
+    def __repr__(self):
+        return "\n".join(
+            "".join("#" if cell else "." for cell in row) for row in self.to_array()
+        )
@@ -0,0 +1,234 @@
+import itertools
+from dataclasses import dataclass
+from typing import Generator
+
+import numpy as np
+
+# Cell keys of the grid must fit in an int64
+_MAX_CELLS = 2**62
+# The number of pairs of points compared at once, about 200 MB of intermediates
+_MAX_CANDIDATES = 2**22
+# The number of candidate pairs per point above which the first radius is too large
+_MAX_CANDIDATES_PER_POINT = 64
+
+
+def _group_pairs(
+    starts_a: np.ndarray,
+    counts_a: np.ndarray,
+    starts_b: np.ndarray,
+    counts_b: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """All combinations of a member of group a and a member of group b, for each pair
+    of groups, as positions into the sorted points."""
+    sizes = counts_a * counts_b
+    group = np.repeat(np.arange(len(sizes)), sizes)
+    # The index of each combination within its pair of groups
+    offsets = np.arange(group.size) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    left = starts_a[group] + offsets // counts_b[group]
+    right = starts_b[group] + offsets % counts_b[group]
+    return left, right
+
+
+@dataclass
+class CellPairs:
+    """
+    The points bucketed in a grid, and the pairs of cells that are the same or
+    adjacent, without listing their points yet.
+
+    Attributes:
+        order: The order that sorts the points by cell
+        same_cell: Whether both cells of a pair are the same cell
+        starts_a: The start of the first cell of each pair, into the sorted points
+        counts_a: The number of points in the first cell of each pair
+        starts_b: The start of the second cell of each pair
+        counts_b: The number of points in the second cell of each pair
+    """
+
+    order: np.ndarray
+    same_cell: np.ndarray
+    starts_a: np.ndarray
+    counts_a: np.ndarray
+    starts_b: np.ndarray
+    counts_b: np.ndarray
+
+    @classmethod
+    def from_points(cls, points: np.ndarray, radius: float) -> "CellPairs":
+        """Bucket the points in a grid with cells of the size of a radius."""
+        n, dimensions = points.shape
+        cells = ((points - points.min(axis=0)) // radius).astype(np.int64) + 1
+        # Room for the adjacent cells on both sides
+        shape = cells.max(axis=0) + 2
+        strides = np.cumprod([1, *shape[:-1]])
+        keys = cells @ strides
+        order = np.argsort(keys, kind="stable")
+        unique_keys, starts, counts = np.unique(
+            keys[order], return_index=True, return_counts=True
+        )
+        same_cell, cells_a, cells_b = [], [], []
+        for offset in itertools.product([-1, 0, 1], repeat=dimensions):
+            # Each pair of adjacent cells once: the offsets that are positive in the
+            # first non-zero dimension
+            if any(offset) and next(o for o in offset if o) < 0:
+                continue
+            neighbor_keys = unique_keys + np.dot(offset, strides)
+            index = np.minimum(
+                np.searchsorted(unique_keys, neighbor_keys), len(unique_keys) - 1
+            )
+            found = np.flatnonzero(unique_keys[index] == neighbor_keys)
+            same_cell.append(np.full(len(found), not any(offset)))
+            cells_a.append(found)
+            cells_b.append(index[found])
+        cells_a, cells_b = np.concatenate(cells_a), np.concatenate(cells_b)
+        return cls(
+            order,
+            np.concatenate(same_cell),
+            starts[cells_a],
+            counts[cells_a],
+            starts[cells_b],
+            counts[cells_b],
+        )
+
+    @property
+    def candidates(self) -> int:
+        """The number of pairs of points in the pairs of cells, counting those within
+        a cell twice."""
+        return int(np.dot(self.counts_a, self.counts_b))
+
+
+def pairs_within(
+    points: np.ndarray,
+    radius: float,
+    cell_pairs: CellPairs | None = None,
+    max_candidates: int = _MAX_CANDIDATES,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """All pairs of points closer than a radius, found by bucketing the points in a
+    grid with cells of that size. Only points in the same or adjacent cells can be
+    that close, hence only those are compared.
+
+    Args:
+        points: Integer array of shape (n, dimensions)
+        radius: The distance the pairs should be below
+        cell_pairs: The points bucketed for the radius, if already done
+        max_candidates: The number of pairs of points compared at once. Limits the
+            memory, unless a single pair of cells has more
+
+    Returns:
+        The squared distances, and the indices i < j of the pairs, in no particular
+        order
+    """
+    if cell_pairs is None:
+        cell_pairs = CellPairs.from_points(points, radius)
+    sizes = np.cumsum(cell_pairs.counts_a * cell_pairs.counts_b)
+    all_distances, all_i, all_j = [], [], []
+    begin = 0
+    # Chunks of consecutive pairs of cells, of at most max_candidates pairs of
+    # points, or a single pair of cells. Usually one chunk
+    while begin < len(sizes):
+        done = sizes[begin - 1] if begin else 0
+        end = max(
+            np.searchsorted(sizes, done + max_candidates, side="right"), begin + 1
+        )
+        chunk = slice(begin, end)
+        left, right = _group_pairs(
+            cell_pairs.starts_a[chunk],
+            cell_pairs.counts_a[chunk],
+            cell_pairs.starts_b[chunk],
+            cell_pairs.counts_b[chunk],
+        )
+        # Within a cell, each pair once, and not a point with itself
+        same_cell = np.repeat(
+            cell_pairs.same_cell[chunk],
+            cell_pairs.counts_a[chunk] * cell_pairs.counts_b[chunk],
+        )
+        keep = ~same_cell | (left < right)
+        i, j = cell_pairs.order[left[keep]], cell_pairs.order[right[keep]]
+        differences = points[i] - points[j]
+        distances = np.einsum("ij,ij->i", differences, differences)
+        close = distances < radius**2
+        i, j = i[close], j[close]
+        all_distances.append(distances[close])
+        all_i.append(np.minimum(i, j))
+        all_j.append(np.maximum(i, j))
+        begin = end
+    if not all_distances:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    return (
+        np.concatenate(all_distances),
+        np.concatenate(all_i),
+        np.concatenate(all_j),
+    )
+
+
+def _neighbor_distance(points: np.ndarray, samples: int = 100) -> float:
+    """The median distance of a sample of the points to their nearest other point.
+    Unlike an estimate from the bounding box, this is not thrown off by outliers."""
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(points), size=min(samples, len(points)), replace=False)
+    nearest = []
+    for k in sample:
+        differences = points - points[k]
+        distances = np.einsum("ij,ij->i", differences, differences)
+        distances[k] = np.iinfo(np.int64).max
+        nearest.append(distances.min())
+    return float(np.median(nearest)) ** 0.5
+
+
+def closest_pairs(points: np.ndarray) -> Generator[tuple[int, int, int], None, None]:
+    """Yield all pairs of points in increasing squared euclidean distance, lazily.
+
+    Instead of sorting all n(n-1)/2 pairs, the pairs are found in rounds of growing
+    radius with pairs_within(), starting at the typical distance between neighboring
+    points. Each round sorts only the pairs that are new within its radius. Hence, a
+    consumer that stops early only pays for the pairs up to about the distance it
+    stopped at.
+
+    The typical distance is estimated from the bounding box. If outliers make that
+    estimate far too large, such that the first round would compare many pairs per
+    point, it is estimated from a sample of the points instead. Any round that would
+    compare too many pairs is reduced in radius.
+
+    Args:
+        points: Array of shape (n, dimensions), of integer coordinates
+
+    Returns:
+        (squared distance, i, j) with i < j indices of the points, ordered on
+        distance, then i, then j
+    """
+    points = np.asarray(points, dtype=np.int64)
+    if len(points) < 2:
+        return
+    n, dimensions = points.shape
+    extent = points.max(axis=0) - points.min(axis=0) + 1
+    max_distance = int(np.sum(extent.astype(object) ** 2))
+    if max_distance >= np.iinfo(np.int64).max:
+        raise ValueError("The points are too far apart to compare the distances")
+    # About one neighbor per point within the first radius, and few enough cells
+    spacing = float(np.prod(extent.astype(float)) / n) ** (1 / dimensions)
+    min_radius = float(extent.max()) / (_MAX_CELLS ** (1 / dimensions) - 3)
+    radius = max(spacing, min_radius, 1.0)
+    cell_pairs = CellPairs.from_points(points, radius)
+    if cell_pairs.candidates > _MAX_CANDIDATES_PER_POINT * n:
+        radius = max(min(_neighbor_distance(points), radius), min_radius, 1.0)
+        cell_pairs = CellPairs.from_points(points, radius)
+    done = 0
+    while done <= max_distance:
+        # Halve the area of the round while it compares too many pairs, as long as it
+        # still covers new distances
+        while (
+            cell_pairs.candidates > _MAX_CANDIDATES
+            and (smaller := radius / 2**0.5) ** 2 > done
+            and smaller >= min_radius
+        ):
+            radius = smaller
+            cell_pairs = CellPairs.from_points(points, radius)
+        distances, i, j = pairs_within(points, radius, cell_pairs)
+        new = distances >= done
+        distances, i, j = distances[new], i[new], j[new]
+        order = np.lexsort((j, i, distances))
+        yield from zip(distances[order].tolist(), i[order].tolist(), j[order].tolist())
+        done = int(np.ceil(radius**2))
+        # Twice the squared radius of the previous round
+        radius *= 2**0.5
+        if done <= max_distance:
+            cell_pairs = CellPairs.from_points(points, radius)
@@ -6,6 +6,30 @@ from pathlib import Path
 _current_dir = Path(os.path.dirname(__file__))
 TEMPLATE_VERSION = "v20231204"
 TEMPLATES_DIR = _current_dir / ".." / "_templates" / TEMPLATE_VERSION
+PACKAGE_DIR = (_current_dir / "..").resolve()
+BASELINE_FILE = PACKAGE_DIR / ".." / ".." / "benchmarks" / "baseline.json"
 
 def solutions_dir(year: int) -> Path:
-    return _current_dir / ".." / f"_{year}" / "solutions"
\ No newline at end of file
+    return _current_dir / ".." / f"_{year}" / "solutions"
+
+
+def solution_years() -> list[int]:
+    """All years that have a solutions directory, in ascending order."""
+    return sorted(
+        int(path.parent.name[1:])
+        for path in PACKAGE_DIR.glob("_[0-9][0-9][0-9][0-9]/solutions")
+    )
+
+
+# Set this environment variable to "1" to read inputs from the local store instead of aocd
+OFFLINE_ENV_VAR = "ADVENTOFCODE_OFFLINE"
+STORE_DIR = Path(
+    os.environ.get(
+        "ADVENTOFCODE_STORE", Path.home() / ".config" / "adventofcode" / "store"
+    )
+)
+CACHE_DIR = Path(
+    os.environ.get(
+        "ADVENTOFCODE_CACHE", Path.home() / ".cache" / "adventofcode" / "results"
+    )
+)
@@ -0,0 +1,117 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Callable, Hashable, Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+def fingerprint(state: np.ndarray) -> Hashable:
+    """A cheap key for the contents of an array: its shape and type, and a 128 bit
+    digest of its bytes. Unlike a string render of the array, this is a single pass
+    over the raw data, and only the digest is kept."""
+    array = np.ascontiguousarray(state)
+    digest = hashlib.blake2b(array.data, digest_size=16).digest()
+    return array.shape, array.dtype.str, digest
+
+
+@dataclass
+class Cycle:
+    """
+    A repetition of an evolving state: the state after start + length steps equals
+    the state after start steps, hence the states repeat every length steps from
+    there on.
+
+    Attributes:
+        start: The number of steps before the first state of the cycle
+        length: The number of steps in the cycle
+    """
+
+    start: int
+    length: int
+
+    def equivalent_step(self, steps: int) -> int:
+        """The number of steps, before the end of the first cycle, after which the
+        state equals the state after the given number of steps."""
+        if steps < self.start:
+            return steps
+        return self.start + (steps - self.start) % self.length
+
+    def extrapolate(self, values: Sequence[int], steps: int) -> int:
+        """Extrapolate a value that grows by the same amount each cycle, such as the
+        height of a tower, to any number of steps.
+
+        Args:
+            values: The value after 0, 1, ... steps, up to at least the end of the
+                first cycle (start + length steps)
+            steps: The number of steps to extrapolate to
+        """
+        if steps < len(values):
+            return values[steps]
+        cycles, offset = divmod(steps - self.start, self.length)
+        growth = values[self.start + self.length] - values[self.start]
+        return values[self.start + offset] + cycles * growth
+
+
+class CycleDetector:
+    """
+    Detect the first repeat of an evolving state. Add the state after each step, the
+    detector keeps only the key of each state.
+
+    Attributes:
+        key: Maps a state to a hashable key. Two states with the same key are assumed
+            to evolve the same. Defaults to the fingerprint of an array state
+        steps: The number of states added so far
+    """
+
+    key: Callable[[T], Hashable]
+    steps: int
+
+    def __init__(self, key: Callable[[T], Hashable] = fingerprint):
+        self.key = key
+        self.steps = 0
+        self._seen: dict[Hashable, int] = {}
+
+    def add(self, state: T) -> Cycle | None:
+        """Add the state after the next step, the first added state being the initial
+        state.
+
+        Returns:
+            The cycle, if the state was added before. None otherwise
+        """
+        key = self.key(state)
+        step, self.steps = self.steps, self.steps + 1
+        if key in self._seen:
+            return Cycle(self._seen[key], step - self._seen[key])
+        self._seen[key] = step
+        return None
+
+
+def iterate(
+    state: T,
+    step: Callable[[T], T],
+    steps: int,
+    key: Callable[[T], Hashable] = fingerprint,
+) -> T:
+    """Apply a step function a number of times. Once a state repeats, the whole cycles
+    in the remaining steps are skipped, and only the remainder is simulated.
+
+    Args:
+        state: The initial state
+        step: Maps a state to the next state. May change the state in place, and
+            return it, as long as the key is computed from the current state
+        steps: The number of times to apply step
+        key: Maps a state to a hashable key. Defaults to the fingerprint of an array
+
+    Returns:
+        The state after the given number of steps
+    """
+    detector = CycleDetector(key)
+    for done in range(steps):
+        if (cycle := detector.add(state)) is not None:
+            for _ in range((steps - done) % cycle.length):
+                state = step(state)
+            return state
+        state = step(state)
+    return state
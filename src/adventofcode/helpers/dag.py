@@ -0,0 +1,92 @@
+from typing import Collection, Hashable, Iterable, Mapping, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+# The DFS state of a node: on the current path, or finished
+_ON_PATH, _DONE = 1, 2
+
+
+class CycleError(Exception):
+    def __init__(self, node):
+        super().__init__(f"The graph has a cycle through {node!r}")
+
+
+def topological_order(
+    successors: Mapping[T, Iterable[T]], start: T, stop_at: Collection[T] = ()
+) -> list[T]:
+    """The nodes reachable from a start node, each after all its successors (reverse
+    topological order). An iterative DFS, such that deep graphs do not hit the
+    recursion limit.
+
+    Args:
+        successors: The successors of each node. Nodes without are leaves
+        start: The node to start from
+        stop_at: Nodes of which the successors are not followed
+
+    Raises:
+        CycleError: If a cycle is reachable from the start node
+    """
+    state = {start: _ON_PATH}
+    order = []
+    stack = [(start, iter(() if start in stop_at else successors.get(start, ())))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            child_state = state.get(child)
+            if child_state == _ON_PATH:
+                raise CycleError(child)
+            if child_state is None:
+                state[child] = _ON_PATH
+                grandchildren = () if child in stop_at else successors.get(child, ())
+                stack.append((child, iter(grandchildren)))
+                break
+        else:
+            stack.pop()
+            state[node] = _DONE
+            order.append(node)
+    return order
+
+
+def count_paths(
+    successors: Mapping[T, Iterable[T]],
+    start: T,
+    end: T,
+    required: Iterable[T] = (),
+) -> int:
+    """Count the paths from start to end that visit all required nodes, without
+    listing them.
+
+    Dynamic programming in reverse topological order: for each node, the number of
+    paths from it to the end, per subset (bitmask) of the required nodes that a path
+    visits. This takes O((nodes + edges) * 2^required) time, and the counts are exact
+    python ints, however many paths there are.
+
+    Args:
+        successors: The successors of each node. A successor listed twice counts as two
+            edges
+        start: The first node of the paths
+        end: The last node of the paths. Paths end at the first visit of this node
+        required: The nodes each path should visit
+
+    Raises:
+        CycleError: If a cycle is reachable from the start node, before the end node
+    """
+    # A waypoint listed twice is one waypoint
+    bits = {node: 1 << k for k, node in enumerate(dict.fromkeys(required))}
+    masks = 1 << len(bits)
+    paths: dict[T, list[int]] = {}
+    for node in topological_order(successors, start, stop_at={end}):
+        counts = [0] * masks
+        if node == end:
+            counts[0] = 1
+        else:
+            for child in successors.get(node, ()):
+                for mask, count in enumerate(paths[child]):
+                    counts[mask] += count
+        if bit := bits.get(node, 0):
+            visited = [0] * masks
+            for mask, count in enumerate(counts):
+                visited[mask | bit] += count
+            counts = visited
+        paths[node] = counts
+    return paths[start][masks - 1]
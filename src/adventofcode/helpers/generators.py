@@ -0,0 +1,241 @@
+from typing import Callable
+
+import numpy as np
+
+from adventofcode.helpers.ray_cast import RayTable
+
+# All generators take a scale and a random generator, and return a puzzle input. The
+# scale multiplies the number of elements (cells, ranges, points, nodes) of the base
+# input, which is sized to resemble an actual puzzle input.
+
+
+def character_grid(
+    scale: float,
+    rng: np.random.Generator,
+    symbols: dict[str, float],
+    base_cells: int = 140 * 140,
+) -> str:
+    """A square grid of random symbols.
+
+    Args:
+        scale: Multiplier on the number of cells
+        rng: The random generator
+        symbols: The symbols, and their probabilities
+        base_cells: The number of cells at scale 1
+    """
+    side = max(2, round((base_cells * scale) ** 0.5))
+    choices = rng.choice(
+        np.array(list(symbols.keys())), size=(side, side), p=list(symbols.values())
+    )
+    return "\n".join("".join(row) for row in choices)
+
+
+def beam_splitter_grid(scale: float, rng: np.random.Generator) -> str:
+    """A grid with a start at the top, and splitters on every other row (2025/07).
+
+    Like in the actual input, splitters are never next to each other: on each row
+    they are only on every other column, alternating between rows. Two adjacent
+    splitters would send a beam back and forth between them forever, which this
+    construction rules out.
+    """
+    grid = character_grid(scale, rng, {".": 1.0}, base_cells=141 * 142)
+    rows = [list(row) for row in grid.split("\n")]
+    start = len(rows[0]) // 2
+    rows[0][start] = "S"
+    for k, row in enumerate(rows[2::2]):
+        columns = np.arange((start + k) % 2, len(row), 2)
+        for j in columns[rng.random(len(columns)) < 0.2]:
+            row[j] = "^"
+    return "\n".join("".join(row) for row in rows)
+
+
+def _seating_rounds(seats: np.ndarray, look_far: bool, max_rounds: int) -> int | None:
+    """Simulate the seating rules of 2020/11 on a boolean array of seats.
+
+    Returns:
+        The number of rounds until the seats are stable, None if they are not stable
+        within max_rounds (eg a cycle)
+    """
+    height, width = seats.shape
+    if look_far:
+        rays = RayTable(seats)
+        visible = np.stack([rays.targets(d).ravel() for d in rays.directions])
+    tolerance = 5 if look_far else 4
+    # One extra, never occupied seat at the end, for the rays that see no seat (-1)
+    occupied = np.zeros(height * width + 1, dtype=bool)
+    for rounds in range(max_rounds):
+        if look_far:
+            counts = occupied[visible].sum(axis=0)
+        else:
+            padded = np.pad(occupied[:-1].reshape(height, width), 1).astype(np.uint8)
+            counts = sum(
+                padded[1 + di : height + 1 + di, 1 + dj : width + 1 + dj]
+                for di in (-1, 0, 1)
+                for dj in (-1, 0, 1)
+                if di or dj
+            ).ravel()
+        new_occupied = seats.ravel() & np.where(
+            occupied[:-1], counts < tolerance, counts == 0
+        )
+        if np.array_equal(new_occupied, occupied[:-1]):
+            return rounds
+        occupied[:-1] = new_occupied
+    return None
+
+
+def seat_layout(
+    scale: float, rng: np.random.Generator, block: int = 12, attempts: int = 10
+) -> str:
+    """Seats (L) and floor (.) that become stable under both rules of 2020/11.
+
+    Uniformly random layouts often end in a cycle of two states under the adjacent
+    rule, such that part a never finishes. Hence, the layout is built from blocks,
+    separated by a line of floor. Under the adjacent rule the blocks evolve
+    independently, and each block is drawn until it becomes stable. The whole layout
+    is drawn again until it also becomes stable under the visible rule.
+
+    Raises:
+        RuntimeError: If no stable layout was found in the given number of attempts
+    """
+    side = max(2, round((140 * 140 * scale) ** 0.5))
+    for _ in range(attempts):
+        seats = np.zeros((side, side), dtype=bool)
+        for i in range(0, side, block + 1):
+            for j in range(0, side, block + 1):
+                shape = min(block, side - i), min(block, side - j)
+                while True:
+                    cells = rng.random(shape) >= 0.2
+                    if _seating_rounds(cells, False, 10 * block) is not None:
+                        break
+                seats[i : i + shape[0], j : j + shape[1]] = cells
+        if _seating_rounds(seats, True, 4 * side + 100) is not None:
+            return "\n".join("".join(row) for row in np.where(seats, "L", "."))
+    raise RuntimeError(f"No stable seat layout found in {attempts} attempts")
+
+
+def fresh_ingredient_ranges(scale: float, rng: np.random.Generator) -> str:
+    """Inclusive ranges, a blank line, and ingredient ids (2025/05)."""
+    num_ranges, num_ids = round(180 * scale), round(1000 * scale)
+    max_value = 10**14
+    starts = rng.integers(1, max_value, size=num_ranges)
+    lengths = rng.integers(0, max_value // max(num_ranges, 1), size=num_ranges)
+    ids = rng.integers(1, max_value, size=num_ids)
+    return "\n".join(
+        [f"{start}-{start + length}" for start, length in zip(starts, lengths)]
+        + [""]
+        + [str(id_) for id_ in ids]
+    )
+
+
+def almanac(scale: float, rng: np.random.Generator) -> str:
+    """Seed ranges, and seven maps of (destination, source, length) ranges (2023/05)."""
+    names = [
+        "seed-to-soil",
+        "soil-to-fertilizer",
+        "fertilizer-to-water",
+        "water-to-light",
+        "light-to-temperature",
+        "temperature-to-humidity",
+        "humidity-to-location",
+    ]
+    max_value = 2**32
+    num_seed_ranges, num_entries = round(10 * scale), round(30 * scale)
+    seeds = rng.integers(0, max_value, size=(num_seed_ranges, 2)) // [1, 1000]
+    sections = ["seeds: " + " ".join(str(v) for v in seeds.flatten())]
+    for name in names:
+        # Non-overlapping source ranges, shuffled into a random destination order
+        bounds = np.sort(rng.choice(max_value, size=num_entries + 1, replace=False))
+        lengths = np.diff(bounds)
+        destinations = rng.permutation(bounds[:-1])
+        entries = [
+            f"{destination} {source} {length}"
+            for destination, source, length in zip(destinations, bounds[:-1], lengths)
+        ]
+        sections.append(f"{name} map:\n" + "\n".join(entries))
+    return "\n\n".join(sections)
+
+
+def point_cloud(scale: float, rng: np.random.Generator) -> str:
+    """Comma separated 3D points, one per line (2025/08)."""
+    points = rng.integers(0, 100000, size=(round(1000 * scale), 3))
+    return "\n".join(",".join(str(v) for v in point) for point in points)
+
+
+def device_graph(scale: float, rng: np.random.Generator) -> str:
+    """A layered DAG of devices from 'you' and 'svr' to 'out' via 'fft' and 'dac' (2025/11)."""
+    num_nodes = round(600 * scale)
+    names = [f"n{i}" for i in range(num_nodes)]
+    # Nodes only connect to later nodes, such that the graph is acyclic
+    names[0], names[num_nodes // 3], names[2 * num_nodes // 3] = "svr", "fft", "dac"
+    names[num_nodes // 10] = "you"
+    lines = []
+    for i, name in enumerate(names):
+        later = np.arange(i + 1, min(i + 20, num_nodes))
+        if len(later) == 0:
+            targets = ["out"]
+        else:
+            targets = [names[j] for j in rng.choice(later, size=min(2, len(later)))]
+        lines.append(f"{name}: {' '.join(sorted(set(targets)))}")
+    return "\n".join(lines)
+
+
+def module_configuration(scale: float, rng: np.random.Generator) -> str:
+    """Binary counters of flip-flops, all ending in a conjunction to rx (2023/20).
+
+    Like in the actual input, the broadcaster starts a chain of twelve flip-flops
+    per counter. The flip-flops of the one bits of a prime period feed a conjunction,
+    which resets the counter once they are all high, and signals the final
+    conjunction through an inverter. Random wiring instead causes pulse storms, and
+    has no rx. The number of counters grows with the scale, and with it the pulses
+    per button press.
+    """
+    bits = 12
+    num_counters = max(1, round(4 * scale))
+    candidates = np.arange(2 ** (bits - 1) + 1, 2**bits, 2)
+    primes = [p for p in candidates if all(p % d for d in range(3, int(p**0.5) + 1, 2))]
+    periods = rng.choice(primes, size=num_counters, replace=num_counters > len(primes))
+    lines = ["broadcaster -> " + ", ".join(f"c{k}f0" for k in range(num_counters))]
+    for k, period in enumerate(periods):
+        hub, one_bits = f"c{k}h", [(period >> bit) & 1 for bit in range(bits)]
+        for bit, one in enumerate(one_bits):
+            targets = [f"c{k}f{bit + 1}"] if bit + 1 < bits else []
+            if one:
+                targets.append(hub)
+            lines.append(f"%c{k}f{bit} -> {', '.join(targets)}")
+        # The lowest bit is always one, as the period is odd
+        resets = [f"c{k}f{bit}" for bit, one in enumerate(one_bits) if not one]
+        lines.append(f"&{hub} -> {', '.join([f'c{k}f0', *resets, f'c{k}i'])}")
+        lines.append(f"&c{k}i -> rxin")
+    lines.append("&rxin -> rx")
+    return "\n".join(lines)
+
+
+InputGenerator = Callable[[float, np.random.Generator], str]
+
+
+def _grid(symbols: dict[str, float]) -> InputGenerator:
+    return lambda scale, rng: character_grid(scale, rng, symbols)
+
+
+GENERATORS: dict[tuple[int, int], InputGenerator] = {
+    (2020, 11): seat_layout,
+    (2023, 5): almanac,
+    (2023, 14): _grid({".": 0.6, "O": 0.25, "#": 0.15}),
+    (2023, 20): module_configuration,
+    (2024, 10): _grid({str(i): 0.1 for i in range(10)}),
+    (2024, 12): _grid({"A": 0.4, "B": 0.3, "C": 0.2, "D": 0.1}),
+    (2025, 4): _grid({"@": 0.6, ".": 0.4}),
+    (2025, 5): fresh_ingredient_ranges,
+    (2025, 7): beam_splitter_grid,
+    (2025, 8): point_cloud,
+    (2025, 11): device_graph,
+}
+
+
+def generate_input(year: int, day: int, scale: float, seed: int = 0) -> str:
+    """Generate a synthetic input for a puzzle.
+
+    Raises:
+        KeyError: If there is no generator for the puzzle
+    """
+    return GENERATORS[(year, day)](scale, np.random.default_rng(seed))
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from adventofcode.helpers.config import OFFLINE_ENV_VAR, STORE_DIR
+
+
+class InputStore:
+    """
+    Local, content-addressed store of puzzle inputs and answers. Layout:
+
+        {root}/{year}/{day}/inputs/{sha256 of input}.txt
+        {root}/{year}/{day}/index.json
+
+    The index points to the current input of the day, and holds the known answers.
+    Inputs are never overwritten: storing a changed input adds a new blob.
+    """
+
+    root: Path
+
+    def __init__(self, root: Path | None = None):
+        self.root = Path(root) if root is not None else STORE_DIR
+
+    def day_dir(self, year: int, day: int) -> Path:
+        return self.root / str(year) / f"{day:02d}"
+
+    def _read_index(self, year: int, day: int) -> dict:
+        path = self.day_dir(year, day) / "index.json"
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_index(self, year: int, day: int, index: dict) -> None:
+        path = self.day_dir(year, day) / "index.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+
+    def input_sha(self, year: int, day: int) -> str | None:
+        """The SHA256 of the current input of a day, None if none is stored."""
+        return self._read_index(year, day).get("input")
+
+    def has_input(self, year: int, day: int) -> bool:
+        return self.input_sha(year, day) is not None
+
+    def put_input(self, year: int, day: int, data: str) -> str:
+        """Store an input, and make it the current input of the day.
+
+        Returns:
+            The SHA256 of the input
+        """
+        content = data.encode("utf-8")
+        sha = hashlib.sha256(content).hexdigest()
+        path = self.day_dir(year, day) / "inputs" / f"{sha}.txt"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+        index = self._read_index(year, day)
+        index["input"] = sha
+        self._write_index(year, day, index)
+        return sha
+
+    def input_path(self, year: int, day: int) -> Path:
+        """The file of the current input of a day. Can be memory mapped directly, eg
+        by BaseMatrix or parsing.as_matrix, for very large inputs.
+
+        Raises:
+            FileNotFoundError: If no input is stored for the day
+        """
+        sha = self.input_sha(year, day)
+        if sha is None:
+            raise FileNotFoundError(f"No input stored for {year}/{day:02d}")
+        return self.day_dir(year, day) / "inputs" / f"{sha}.txt"
+
+    def get_input(self, year: int, day: int) -> str:
+        """Read the current input of a day. Large inputs are better memory mapped
+        through input_path(), as decoding them copies the whole input anyway.
+
+        Raises:
+            FileNotFoundError: If no input is stored for the day
+        """
+        # Not read_text, which would translate the newlines of the stored bytes
+        return self.input_path(year, day).read_bytes().decode("utf-8")
+
+    def get_answer(self, year: int, day: int, part: str) -> str | None:
+        return self._read_index(year, day).get(f"answer_{part}")
+
+    def put_answer(self, year: int, day: int, part: str, answer: Any) -> None:
+        index = self._read_index(year, day)
+        index[f"answer_{part}"] = str(answer)
+        self._write_index(year, day, index)
+
+    def import_from_aocd(self, year: int, day: int) -> str:
+        """Copy the input and the known answers of a day from aocd into the store.
+
+        Returns:
+            The SHA256 of the input
+        """
+        from aocd.models import Puzzle
+
+        puzzle = Puzzle(year, day)
+        sha = self.put_input(year, day, puzzle.input_data)
+        for part in ["a", "b"]:
+            if getattr(puzzle, f"answered_{part}"):
+                self.put_answer(year, day, part, getattr(puzzle, f"answer_{part}"))
+        return sha
+
+
+class LocalPuzzle:
+    """
+    Stand-in for aocd.models.Puzzle, backed by the InputStore. Never touches the network.
+
+    Setting an answer stores it if no answer is known yet. If an answer is known and
+    differs, a warning is logged instead, and the known answer is kept.
+    """
+
+    def __init__(self, year: int, day: int, store: InputStore | None = None):
+        self.year = year
+        self.day = day
+        self.store = store or InputStore()
+
+    @property
+    def input_data(self) -> str:
+        return self.store.get_input(self.year, self.day)
+
+    def _get_answer(self, part: str) -> str | None:
+        return self.store.get_answer(self.year, self.day, part)
+
+    def _set_answer(self, part: str, value: Any) -> None:
+        known = self._get_answer(part)
+        if known is None:
+            self.store.put_answer(self.year, self.day, part, value)
+        elif known != str(value):
+            logging.warning(
+                "Answer %s of %s/%02d is %s, while the known answer is %s",
+                part,
+                self.year,
+                self.day,
+                value,
+                known,
+            )
+
+    @property
+    def answer_a(self) -> str | None:
+        return self._get_answer("a")
+
+    @answer_a.setter
+    def answer_a(self, value: Any) -> None:
+        self._set_answer("a", value)
+
+    @property
+    def answer_b(self) -> str | None:
+        return self._get_answer("b")
+
+    @answer_b.setter
+    def answer_b(self, value: Any) -> None:
+        self._set_answer("b", value)
+
+    @property
+    def answered_a(self) -> bool:
+        return self.answer_a is not None
+
+    @property
+    def answered_b(self) -> bool:
+        return self.answer_b is not None
+
+    def __repr__(self):
+        return f"<LocalPuzzle({self.year}, {self.day})>"
+
+
+def is_offline() -> bool:
+    return os.environ.get(OFFLINE_ENV_VAR) == "1"
+
+
+def create_puzzle(year: int, day: int):
+    """Create the puzzle backend: a LocalPuzzle when offline, else an aocd Puzzle.
+
+    aocd is only imported when it is used, such that offline runs do not pay its
+    startup cost.
+    """
+    if is_offline():
+        return LocalPuzzle(year, day)
+    from aocd.models import Puzzle
+
+    return Puzzle(year, day)
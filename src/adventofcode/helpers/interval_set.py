@@ -0,0 +1,144 @@
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+
+class IntervalSet:
+    """
+    A set of integers, stored as sorted, disjoint, half-open intervals [start, end).
+    Overlapping and adjacent intervals are merged, such that each set has exactly one
+    representation. Lookups bisect the sorted bounds, and set operations sweep over
+    the bounds of both sets, in O((n + m) log(n + m)) for n and m intervals.
+
+    Attributes:
+        starts: The sorted starts of the intervals
+        ends: The ends of the intervals (exclusive), in the same order
+    """
+
+    starts: list[int]
+    ends: list[int]
+
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()):
+        """
+        Args:
+            intervals: Half-open (start, end) intervals, in any order. May overlap.
+                Empty intervals are ignored
+        """
+        self.starts, self.ends = [], []
+        for start, end in sorted(
+            interval for interval in intervals if interval[0] < interval[1]
+        ):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    @classmethod
+    def from_inclusive(cls, intervals: Iterable[tuple[int, int]]) -> "IntervalSet":
+        """Create the set from inclusive (first, last) intervals, like "3-5"."""
+        return cls((first, last + 1) for first, last in intervals)
+
+    @classmethod
+    def _from_sorted(cls, starts: list[int], ends: list[int]) -> "IntervalSet":
+        result = cls()
+        result.starts, result.ends = starts, ends
+        return result
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def __len__(self) -> int:
+        """The number of intervals."""
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, IntervalSet)
+            and self.starts == other.starts
+            and self.ends == other.ends
+        )
+
+    @property
+    def size(self) -> int:
+        """The number of integers in the set."""
+        return sum(self.ends) - sum(self.starts)
+
+    def __contains__(self, value: int) -> bool:
+        k = bisect_right(self.starts, value) - 1
+        return k >= 0 and value < self.ends[k]
+
+    def contains_many(self, values: Iterable[int] | np.ndarray) -> np.ndarray:
+        """Membership of many values at once, as a boolean array."""
+        values = np.asarray(values)
+        if not self:
+            return np.zeros(values.shape, dtype=bool)
+        k = np.searchsorted(np.asarray(self.starts), values, side="right") - 1
+        return (k >= 0) & (values < np.asarray(self.ends)[np.maximum(k, 0)])
+
+    def _combine(
+        self, other: "IntervalSet", keep: Callable[[bool, bool], bool]
+    ) -> "IntervalSet":
+        """Sweep over the bounds of both sets. Between two consecutive bounds,
+        membership of both sets is constant, hence so is that of the result."""
+        bounds = sorted({*self.starts, *self.ends, *other.starts, *other.ends})
+        starts, ends = [], []
+        inside = False
+        for bound in bounds:
+            keep_bound = keep(bound in self, bound in other)
+            if keep_bound and not inside:
+                starts.append(bound)
+            elif inside and not keep_bound:
+                ends.append(bound)
+            inside = keep_bound
+        return IntervalSet._from_sorted(starts, ends)
+
+    def __or__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, lambda a, b: a or b)
+
+    def __and__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, lambda a, b: a and b)
+
+    def __sub__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, lambda a, b: a and not b)
+
+    def shift(self, offset: int) -> "IntervalSet":
+        """Move all intervals by an offset."""
+        return IntervalSet._from_sorted(
+            [start + offset for start in self.starts],
+            [end + offset for end in self.ends],
+        )
+
+    def map_pieces(self, pieces: Iterable[tuple[int, int, int]]) -> "IntervalSet":
+        """Map the set piecewise: the values in a piece are moved by its offset, the
+        values outside all pieces stay. Intervals that span several pieces are split.
+
+        Args:
+            pieces: Disjoint (start, end, offset) pieces, with half-open [start, end)
+
+        Returns:
+            The mapped set. Mapped intervals that overlap are merged
+        """
+        pieces = list(pieces)
+        moved = []
+        for start, end, offset in pieces:
+            # The intervals that overlap the piece, clipped to it
+            first = bisect_right(self.ends, start)
+            last = bisect_left(self.starts, end)
+            for k in range(first, last):
+                moved.append(
+                    (
+                        max(self.starts[k], start) + offset,
+                        min(self.ends[k], end) + offset,
+                    )
+                )
+        domain = IntervalSet((start, end) for start, end, _ in pieces)
+        return IntervalSet([*moved, *(self - domain)])
+
+    def __repr__(self):
+        intervals = ", ".join(f"[{start}, {end})" for start, end in self)
+        return f"IntervalSet({intervals})"
@@ -0,0 +1,71 @@
+import os
+import resource
+import signal
+from contextlib import contextmanager
+
+
+class TaskTimeoutError(Exception):
+    def __init__(self, timeout: float):
+        super().__init__(f"Exceeded the time budget of {timeout}s")
+
+
+class MemoryBudgetError(Exception):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Exceeded the memory budget of {max_bytes / 2**20:.0f}MiB")
+
+
+@contextmanager
+def time_limit(seconds: float | None):
+    """Raise TaskTimeoutError in the main thread if the block takes longer than seconds.
+
+    Uses a real-time interval timer, so it only works in the main thread of a process
+    (eg a worker of a process pool). If seconds is None, there is no limit.
+    """
+    if seconds is None:
+        yield
+        return
+
+    def handler(signum, frame):
+        raise TaskTimeoutError(seconds)
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _address_space_size() -> int:
+    """The current virtual memory size of this process, in bytes. 0 if unknown."""
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+@contextmanager
+def memory_limit(max_bytes: int | None):
+    """Raise MemoryBudgetError if the block allocates more than max_bytes.
+
+    Limits the address space of the process (RLIMIT_AS) to its current size plus
+    max_bytes, such that allocations fail with a MemoryError instead of the process
+    being killed by the OS. Intended for worker processes. If max_bytes is None, there
+    is no limit.
+    """
+    if max_bytes is None:
+        yield
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = _address_space_size() + max_bytes
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    try:
+        yield
+    except MemoryError as e:
+        raise MemoryBudgetError(max_bytes) from e
+    finally:
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
@@ -0,0 +1,72 @@
+from typing import Callable
+
+import numpy as np
+
+from adventofcode.helpers.base_matrix import BaseMatrix
+from adventofcode.helpers.benchmark import StageTimings, peak_memory, timed
+from adventofcode.helpers.generators import character_grid
+
+# Microbenchmarks of the grid helpers the solutions use in their hot loops. Each takes
+# a matrix, and exhausts the helper on every cell.
+
+
+def iterate_cells(matrix: BaseMatrix) -> int:
+    return sum(1 for _ in matrix.iter_topleft_to_bottomright())
+
+
+def iterate_adjacent_fields(matrix: BaseMatrix) -> int:
+    return sum(
+        1
+        for position in matrix.iter_topleft_to_bottomright()
+        for _ in matrix.adjacent_fields(position)
+    )
+
+
+def walk_axis_neighbors(matrix: BaseMatrix) -> int:
+    return sum(
+        len(position.neighbors(include_diagonal=False))
+        for position in matrix.iter_topleft_to_bottomright()
+    )
+
+
+def find_positions(matrix: BaseMatrix) -> int:
+    return len(matrix.positions_where("@")[0])
+
+
+def count_neighbors(matrix: BaseMatrix) -> int:
+    return int(matrix.neighbor_counts("@").sum())
+
+
+def label_regions(matrix: BaseMatrix) -> int:
+    return len(matrix.label_regions())
+
+
+GRID_OPERATIONS: dict[str, Callable[[BaseMatrix], int]] = {
+    "iter_topleft_to_bottomright": iterate_cells,
+    "adjacent_fields": iterate_adjacent_fields,
+    "neighbors": walk_axis_neighbors,
+    "neighbor_counts": count_neighbors,
+    "positions_where": find_positions,
+    "label_regions": label_regions,
+}
+
+
+def grid_microbenchmark(
+    scale: float = 1, repeats: int = 5, seed: int = 0
+) -> dict[str, StageTimings]:
+    """Time the grid operations, and measure their peak memory, on a random grid.
+
+    Args:
+        scale: Multiplier on the number of cells of the grid (140x140 at scale 1)
+        repeats: The number of timed runs per operation
+        seed: The seed of the random grid
+    """
+    input_ = character_grid(scale, np.random.default_rng(seed), {"@": 0.6, ".": 0.4})
+    matrix = BaseMatrix(input_)
+    timings = {}
+    for name, operation in GRID_OPERATIONS.items():
+        timings[name] = StageTimings(name)
+        for _ in range(repeats):
+            timings[name].times.append(timed(operation, matrix)[1])
+        _, timings[name].peak_bytes = peak_memory(operation, matrix)
+    return timings
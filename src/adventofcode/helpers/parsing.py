@@ -1,8 +1,11 @@
 from io import StringIO
+from pathlib import Path
 from typing import Any, List
 
 import numpy as np
 
+from adventofcode.helpers.base_matrix import parse_byte_grid
+
 
 def as_cols(input_: str, sep: str = " ", caster: callable = int) -> List[List[int]]:
     """
@@ -24,7 +27,7 @@ def as_cols(input_: str, sep: str = " ", caster: callable = int) -> List[List[in
 
 
 def as_matrix(
-    input_: str, sep: str = " ", caster: callable = int, padding: Any = 0
+    input_: str | Path, sep: str = " ", caster: callable = int, padding: Any = 0
 ) -> np.matrix:
     """
     Parses a string input into a NumPy matrix.
@@ -32,7 +35,10 @@ def as_matrix(
     to manual array building and padding.
 
     Args:
-        input_ (str): The input string to parse.
+        input_ (str | Path): The input string to parse, or the path to a file with the
+            input. A file is streamed by np.loadtxt, without first reading it into a
+            string. A file with one character per cell (sep="") is memory mapped
+            instead, with the newlines as the stride between rows.
         sep (str): The separator used in the input string. Default is a space.
         caster (callable): A function to cast the parsed values. Default is int.
         padding (Any): The value to pad the matrix with. Default is 0.
@@ -40,9 +46,17 @@ def as_matrix(
     Returns:
         np.matrix: A NumPy matrix of casted values.
     """
+    if isinstance(input_, Path) and sep == "":
+        return parse_byte_grid(input_).view("S1").astype(caster)
     try:
+        if isinstance(input_, Path):
+            return np.loadtxt(
+                input_, dtype=caster, delimiter=None if sep == " " else sep
+            )
         return np.loadtxt(StringIO(input_.replace(sep, " ")), dtype=caster)
     except ValueError:
+        if isinstance(input_, Path):
+            input_ = input_.read_text(encoding="utf-8").replace(sep, " ")
         # Fallback for variable-length
         print("Reading input as variable-length rows, padding with", padding)
         data = [list(map(int, line.split())) for line in input_.split("\n")]
@@ -0,0 +1,29 @@
+import cProfile
+import io
+import pstats
+from pathlib import Path
+
+
+def profile_path(profile_dir: Path, year: int, day: int, part: str) -> Path:
+    return Path(profile_dir) / f"{year}_{day:02d}_{part}.pstats"
+
+
+def top_functions(path: Path, top: int = 15) -> str:
+    """Render the top functions of a .pstats file, by cumulative and by self time.
+
+    Args:
+        path: The .pstats file
+        top: The number of functions per ranking
+    """
+    stream = io.StringIO()
+    for sort_key, title in [("cumulative", "cumulative time"), ("tottime", "self time")]:
+        stream.write(f"Top {top} functions by {title}\n")
+        stats = pstats.Stats(str(path), stream=stream)
+        stats.strip_dirs().sort_stats(sort_key).print_stats(top)
+    return stream.getvalue()
+
+
+def dump_profile(profiler: cProfile.Profile, path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(path))
+    return path
@@ -0,0 +1,90 @@
+from typing import Iterable
+
+import numpy as np
+
+from adventofcode.helpers.base_matrix import Position
+
+
+def _cast_down(blocked: np.ndarray, dj: int) -> tuple[np.ndarray, np.ndarray]:
+    """Cast rays in direction (1, dj) from all cells. See RayTable for the result.
+
+    Each row follows from the row below it, which is one vectorized step per row.
+    """
+    height, width = blocked.shape
+    steps = np.ones((height, width), dtype=np.int64)
+    hits = np.zeros((height, width), dtype=bool)
+    # The columns that have a neighbor in the next row, and the columns of those
+    sources = slice(max(0, -dj), width - max(0, dj))
+    targets = slice(max(0, dj), width + min(0, dj))
+    for i in range(height - 2, -1, -1):
+        next_blocked = blocked[i + 1, targets]
+        steps[i, sources] = np.where(next_blocked, 1, steps[i + 1, targets] + 1)
+        hits[i, sources] = next_blocked | hits[i + 1, targets]
+    return steps, hits
+
+
+def _cast(blocked: np.ndarray, di: int, dj: int) -> tuple[np.ndarray, np.ndarray]:
+    """Cast rays in any unit direction, by flipping and transposing it to (1, dj)."""
+    if di == 0:
+        steps, hits = _cast(blocked.T, dj, di)
+        return steps.T, hits.T
+    if di < 0:
+        steps, hits = _cast_down(blocked[::-1], dj)
+        return steps[::-1], hits[::-1]
+    return _cast_down(blocked, dj)
+
+
+class RayTable:
+    """
+    For each cell of a grid and each direction, how far a ray from the cell travels
+    before it hits a blocking cell, or leaves the grid. Precomputed with numpy, such
+    that following a ray is a single lookup, instead of a walk over its cells.
+
+    Attributes:
+        directions: The directions of the rays, unit steps like Position.directions()
+        steps: Array of shape (directions, height, width). The number of steps to the
+            first blocking cell, or to the first cell outside the grid if there is none
+        hits: Boolean array of the same shape. Whether the ray hits a blocking cell
+    """
+
+    directions: list[Position]
+    steps: np.ndarray
+    hits: np.ndarray
+
+    def __init__(
+        self, blocked: np.ndarray, directions: Iterable[Position] | None = None
+    ):
+        """
+        Args:
+            blocked: Boolean 2D array of the cells that block rays. A ray starts
+                outside its own cell, so a blocking cell is not blocked by itself
+            directions: The directions to cast rays in. Defaults to all 8 directions
+        """
+        blocked = np.asarray(blocked, dtype=bool)
+        self.directions = list(directions or Position.directions())
+        self._index = {d.tuple_: k for k, d in enumerate(self.directions)}
+        tables = [_cast(blocked, d.i, d.j) for d in self.directions]
+        self.steps = np.stack([steps for steps, _ in tables])
+        self.hits = np.stack([hits for _, hits in tables])
+
+    def cast(self, position: Position, direction: Position) -> tuple[int, bool]:
+        """Follow a ray from a position.
+
+        Returns:
+            The number of steps to the first blocking cell, or out of the grid, and
+            whether a blocking cell was hit
+        """
+        k = self._index[direction.tuple_]
+        return int(self.steps[k, position.i, position.j]), bool(
+            self.hits[k, position.i, position.j]
+        )
+
+    def targets(self, direction: Position) -> np.ndarray:
+        """The blocking cell the ray from each cell hits, as flat index into the grid.
+        -1 for the rays that leave the grid."""
+        k = self._index[direction.tuple_]
+        height, width = self.steps.shape[1:]
+        rows, columns = np.indices((height, width))
+        steps = self.steps[k]
+        flat = (rows + steps * direction.i) * width + columns + steps * direction.j
+        return np.where(self.hits[k], flat, -1)
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from adventofcode.helpers.config import CACHE_DIR, PACKAGE_DIR
+
+
+@lru_cache(maxsize=None)
+def framework_sha() -> str:
+    """SHA256 of the source of the helpers and the templates.
+
+    Solutions depend on these, so any change to them invalidates all cached results.
+    """
+    sha = hashlib.sha256()
+    paths = sorted((PACKAGE_DIR / "helpers").glob("*.py")) + sorted(
+        (PACKAGE_DIR / "_templates").glob("*/*.py")
+    )
+    for path in paths:
+        sha.update(path.read_bytes())
+    return sha.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def source_sha(path: Path) -> str:
+    """SHA256 of the source of a solution file, combined with the framework source."""
+    sha = hashlib.sha256(Path(path).read_bytes())
+    sha.update(framework_sha().encode())
+    return sha.hexdigest()
+
+
+def input_sha(input_data: str) -> str:
+    return hashlib.sha256(input_data.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    year: int
+    day: int
+    part: str
+    input_sha: str
+    source_sha: str
+
+    @classmethod
+    def for_puzzle(cls, puzzle, part: str, input_data: str) -> "CacheKey":
+        """Create the key for a part of a PuzzleToSolve instance.
+
+        The solution source is found through the module the puzzle class is defined in.
+        """
+        path = sys.modules[type(puzzle).__module__].__file__
+        return cls(puzzle.year, puzzle.day, part, input_sha(input_data), source_sha(path))
+
+    @property
+    def relative_path(self) -> Path:
+        return (
+            Path(str(self.year))
+            / f"{self.day:02d}"
+            / self.part
+            / f"{self.input_sha[:16]}-{self.source_sha[:16]}.json"
+        )
+
+
+@dataclass
+class CachedResult:
+    answer: str
+    seconds: float
+
+
+class ResultCache:
+    """
+    On-disk cache of answers, keyed on the input and the source that produced them.
+    Each result is a separate file, such that parallel workers do not conflict.
+    """
+
+    root: Path
+
+    def __init__(self, root: Path | None = None):
+        self.root = Path(root) if root is not None else CACHE_DIR
+
+    def get(self, key: CacheKey) -> CachedResult | None:
+        path = self.root / key.relative_path
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return CachedResult(**json.load(f))
+
+    def put(self, key: CacheKey, answer: Any, seconds: float) -> None:
+        path = self.root / key.relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Numpy scalars are converted to their python equivalent first
+        answer = answer.item() if hasattr(answer, "item") else answer
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"answer": str(answer), "seconds": seconds}, f)
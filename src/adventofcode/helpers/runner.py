@@ -0,0 +1,279 @@
+import cProfile
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from adventofcode.helpers.benchmark import puzzle_inputs, timed
+from adventofcode.helpers.limits import (
+    MemoryBudgetError,
+    TaskTimeoutError,
+    memory_limit,
+    time_limit,
+)
+from adventofcode.helpers.profiling import dump_profile, profile_path
+from adventofcode.helpers.result_cache import CacheKey, ResultCache
+from adventofcode.helpers.solutions import Solution
+
+
+@dataclass
+class Task:
+    """One unit of work for the runner: one or both parts of a solution."""
+
+    solution: Solution
+    parts: tuple[str, ...] = ("a", "b")
+    use_test_input: bool = False
+    timeout: float | None = None
+    use_cache: bool = True
+    profile_dir: Path | None = None
+    parse_once: bool = False
+    max_memory: int | None = None
+
+    @property
+    def year(self) -> int:
+        return self.solution.year
+
+    @property
+    def day(self) -> int:
+        return self.solution.day
+
+
+@dataclass
+class PartResult:
+    """The outcome of solving one part of a puzzle.
+
+    Attributes:
+        status: "ok", "wrong" (test answer mismatch), "budget" (exceeded the time or
+            memory budget), "crashed" (the worker process died) or "error"
+        answer: The answer as string, None if the part did not finish
+        parse_seconds: Wall time of parse_input
+        seconds: Wall time of the part itself
+        error: The error message, if any
+        cached: Whether the answer was taken from the result cache
+        profile: The .pstats file of the part, if it was profiled
+    """
+
+    year: int
+    day: int
+    part: str
+    status: str = "ok"
+    answer: str | None = None
+    parse_seconds: float | None = None
+    seconds: float | None = None
+    error: str | None = None
+    cached: bool = False
+    profile: str | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class RunReport:
+    """All results of a run, and the total wall time."""
+
+    results: list[PartResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "seconds": self.seconds,
+            "results": [result.as_dict() for result in self.results],
+        }
+
+
+def _answer_to_str(answer: Any) -> str:
+    # Numpy scalars are converted to their python equivalent first
+    return str(answer.item() if hasattr(answer, "item") else answer)
+
+
+def solve_part(
+    puzzle,
+    part: str,
+    use_test_input: bool,
+    use_cache: bool = False,
+    profile_dir: Path | None = None,
+) -> PartResult:
+    """Parse the input and solve one part of an instantiated puzzle.
+
+    Args:
+        puzzle: The PuzzleToSolve instance
+        part: "a" or "b"
+        use_test_input: Solve the test input, and check the answer
+        use_cache: Use the result cache for the actual input. If the input and the
+            source did not change, the cached answer and runtime are returned
+        profile_dir: If provided, profile parse_input and the part with cProfile, and
+            write the stats to a .pstats file in this directory. Disables the cache
+    """
+    result = PartResult(puzzle.year, puzzle.day, part)
+    # parse_input_once parses once if the puzzle has parse_once set, and copies after
+    parse_input = getattr(
+        puzzle,
+        "parse_input_once",
+        getattr(puzzle, "parse_input", lambda input_: input_),
+    )
+    raw, kwargs = puzzle_inputs(puzzle, use_test_input)[part]
+    cache_key = None
+    if use_cache and not use_test_input and profile_dir is None:
+        cache_key = CacheKey.for_puzzle(puzzle, part, raw)
+        if cached := ResultCache().get(cache_key):
+            result.answer, result.seconds, result.cached = (
+                cached.answer,
+                cached.seconds,
+                True,
+            )
+            return result
+    profiler = cProfile.Profile() if profile_dir is not None else None
+    with profiler or nullcontext():
+        parsed, result.parse_seconds = timed(parse_input, raw)
+        answer, result.seconds = timed(getattr(puzzle, part), parsed, **kwargs)
+    if profiler is not None:
+        path = profile_path(profile_dir, puzzle.year, puzzle.day, part)
+        result.profile = str(dump_profile(profiler, path))
+    result.answer = _answer_to_str(answer)
+    if cache_key is not None:
+        ResultCache().put(cache_key, answer, result.seconds)
+    if use_test_input and answer != getattr(puzzle, f"test_answer_{part}"):
+        result.status = "wrong"
+    return result
+
+
+def run_task(task: Task) -> list[PartResult]:
+    """Run a task. Executed in a worker process.
+
+    The time and memory budgets are enforced inside the worker: an interval timer
+    interrupts a slow part, and an address space limit makes large allocations fail
+    instead of getting the worker killed. Each part gets the full budgets. The
+    recursion limit, which some solutions raise, is restored after the task, as the
+    worker is reused.
+    """
+    results = []
+    recursion_limit = sys.getrecursionlimit()
+    try:
+        puzzle = task.solution.create()
+        puzzle.parse_once = task.parse_once
+    except Exception as e:  # pylint: disable=broad-except
+        sys.setrecursionlimit(recursion_limit)
+        return [
+            PartResult(task.year, task.day, part, status="error", error=repr(e))
+            for part in task.parts
+        ]
+    for part in task.parts:
+        try:
+            with time_limit(task.timeout), memory_limit(task.max_memory):
+                results.append(
+                    solve_part(
+                        puzzle,
+                        part,
+                        task.use_test_input,
+                        task.use_cache,
+                        task.profile_dir,
+                    )
+                )
+        except (TaskTimeoutError, MemoryBudgetError) as e:
+            results.append(
+                PartResult(task.year, task.day, part, status="budget", error=str(e))
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            results.append(
+                PartResult(task.year, task.day, part, status="error", error=repr(e))
+            )
+    sys.setrecursionlimit(recursion_limit)
+    return results
+
+
+def _crashed(task: Task, error: Exception) -> list[PartResult]:
+    return [
+        PartResult(task.year, task.day, part, status="crashed", error=repr(error))
+        for part in task.parts
+    ]
+
+
+def _run_isolated(task: Task) -> list[PartResult]:
+    """Run a task in a process of its own, such that a crash only affects this task."""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            return executor.submit(run_task, task).result()
+        except BrokenProcessPool as e:
+            return _crashed(task, e)
+
+
+def run_tasks(tasks: list[Task], jobs: int | None = None) -> RunReport:
+    """Run tasks in parallel in a process pool, and collect their results.
+
+    If a worker dies (eg a segfault on a too deep recursion, or killed by the OS), the
+    pool breaks, and all its unfinished tasks fail. Those tasks are rerun with each
+    task in its own process, such that only the task that crashes is reported as such.
+
+    Args:
+        tasks: The tasks to run
+        jobs: The number of worker processes. Defaults to the number of CPUs
+    """
+    report = RunReport()
+    start = time.perf_counter()
+    broken: list[Task] = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(run_task, task): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                report.results.extend(future.result())
+            except BrokenProcessPool:
+                broken.append(task)
+            except Exception as e:  # pylint: disable=broad-except
+                report.results.extend(
+                    PartResult(task.year, task.day, part, status="error", error=repr(e))
+                    for part in task.parts
+                )
+    if broken:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for results in executor.map(_run_isolated, broken):
+                report.results.extend(results)
+    report.seconds = time.perf_counter() - start
+    report.results.sort(key=lambda result: (result.year, result.day, result.part))
+    return report
+
+
+def create_tasks(
+    solutions: list[Solution],
+    *,
+    split_parts: bool = False,
+    use_test_input: bool = False,
+    timeout: float | None = None,
+    use_cache: bool = True,
+    profile_dir: Path | None = None,
+    parse_once: bool = False,
+    max_memory: int | None = None,
+) -> list[Task]:
+    """Create the tasks for a list of solutions.
+
+    Args:
+        solutions: The solutions
+        split_parts: Create separate tasks for a and b, such that they run in parallel
+        use_test_input: Solve the test inputs instead of the actual inputs
+        timeout: The timeout per part, in seconds
+        use_cache: Use the result cache for the actual inputs
+        profile_dir: Profile each part, and write the stats to this directory
+        parse_once: Parse the input of a day once, and give each part a copy. Only
+            has effect if the parts are not split
+        max_memory: The memory budget per part, in bytes
+    """
+    parts_per_task = [("a",), ("b",)] if split_parts else [("a", "b")]
+    return [
+        Task(
+            solution,
+            parts,
+            use_test_input,
+            timeout,
+            use_cache,
+            profile_dir,
+            parse_once,
+            max_memory,
+        )
+        for solution in solutions
+        for parts in parts_per_task
+    ]
@@ -0,0 +1,182 @@
+import heapq
+from typing import Callable, Iterable
+
+import numpy as np
+
+# The distance of unreachable states
+INFINITY = int(np.iinfo(np.int64).max)
+
+# The four axis directions as (di, dj)
+_DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+def dijkstra(
+    num_states: int,
+    sources: Iterable[int],
+    neighbors: Callable[[int], Iterable[tuple[int, int]]],
+    targets: Iterable[int] | None = None,
+) -> np.ndarray:
+    """Dijkstra's algorithm over integer-encoded states.
+
+    Args:
+        num_states: The number of states. States are encoded as 0..num_states - 1
+        sources: The states to start from, at distance 0
+        neighbors: Maps a state to (next state, cost) pairs. Costs are non-negative
+        targets: If provided, stop as soon as the first of these states is settled
+
+    Returns:
+        The distance to each state, INFINITY if unreachable. If stopped at a target,
+        only the distances of settled states (at most the target distance) are final
+    """
+    # A list is much faster than an array for single element access
+    distances = [INFINITY] * num_states
+    settled = bytearray(num_states)
+    targets = frozenset(targets) if targets is not None else frozenset()
+    queue = []
+    for source in sources:
+        distances[source] = 0
+        queue.append((0, source))
+    heapq.heapify(queue)
+    while queue:
+        distance, state = heapq.heappop(queue)
+        if settled[state]:
+            continue
+        settled[state] = 1
+        if state in targets:
+            break
+        for next_state, cost in neighbors(state):
+            next_distance = distance + cost
+            if not settled[next_state] and next_distance < distances[next_state]:
+                distances[next_state] = next_distance
+                heapq.heappush(queue, (next_distance, next_state))
+    return np.array(distances, dtype=np.int64)
+
+
+class GridPathFinder:
+    """
+    Shortest paths over the cells of a grid, where moving into a cell costs the cost
+    of that cell. Moves are horizontal or vertical.
+
+    Optionally, the number of steps in a straight line is constrained. Instead of
+    augmenting the state with the direction and the number of steps taken in it, a
+    whole straight run of min_straight..max_straight steps is one transition, after
+    which the path must turn. The state then is the cell and the axis of the last run,
+    encoded as (i * width + j) * 2 + axis. Otherwise the state is the cell, encoded as
+    i * width + j.
+
+    Attributes:
+        costs: The cost of entering each cell
+        min_straight: The number of steps to take in a direction before turning, or
+            before stopping at a target
+        max_straight: The maximal number of steps in a direction. None if unlimited
+        can_move: Optional rule whether a step between two cells (flat indices) is
+            allowed, on top of staying in the grid
+    """
+
+    costs: np.ndarray
+    min_straight: int
+    max_straight: int | None
+    can_move: Callable[[int, int], bool] | None
+
+    def __init__(
+        self,
+        costs: np.ndarray,
+        *,
+        min_straight: int = 0,
+        max_straight: int | None = None,
+        can_move: Callable[[int, int], bool] | None = None,
+    ):
+        self.costs = np.asarray(costs)
+        self.min_straight = min_straight
+        self.max_straight = max_straight
+        self.can_move = can_move
+        self.height, self.width = self.costs.shape
+        self._costs = self.costs.astype(np.int64).ravel().tolist()
+        self.tracks_direction = min_straight > 1 or max_straight is not None
+
+    @property
+    def num_states(self) -> int:
+        cells = self.height * self.width
+        return cells * 2 if self.tracks_direction else cells
+
+    def states(self, position: tuple[int, int]) -> list[int]:
+        """The states of the cell at a position."""
+        cell = int(position[0]) * self.width + int(position[1])
+        return [cell * 2, cell * 2 + 1] if self.tracks_direction else [cell]
+
+    def _cell_neighbors(self, cell: int) -> list[tuple[int, int]]:
+        costs, width, can_move = self._costs, self.width, self.can_move
+        i, j = divmod(cell, width)
+        neighbors = []
+        for di, dj in _DIRECTIONS:
+            if 0 <= i + di < self.height and 0 <= j + dj < width:
+                next_cell = cell + di * width + dj
+                if can_move is None or can_move(cell, next_cell):
+                    neighbors.append((next_cell, costs[next_cell]))
+        return neighbors
+
+    def _run_neighbors(self, state: int) -> list[tuple[int, int]]:
+        costs, width, can_move = self._costs, self.width, self.can_move
+        cell, axis = divmod(state, 2)
+        i, j = divmod(cell, width)
+        # Axis 0 means the last run was horizontal, hence now run vertically
+        if axis == 0:
+            runs = [(width, self.height - 1 - i), (-width, i)]
+        else:
+            runs = [(1, width - 1 - j), (-1, j)]
+        max_steps = self.max_straight
+        neighbors = []
+        for step, room in runs:
+            steps = room if max_steps is None else min(room, max_steps)
+            current, cost = cell, 0
+            for k in range(1, steps + 1):
+                next_cell = current + step
+                if can_move is not None and not can_move(current, next_cell):
+                    break
+                cost += costs[next_cell]
+                current = next_cell
+                if k >= self.min_straight:
+                    neighbors.append((next_cell * 2 + 1 - axis, cost))
+        return neighbors
+
+    def distances(
+        self,
+        sources: Iterable[tuple[int, int]],
+        targets: Iterable[tuple[int, int]] | None = None,
+    ) -> np.ndarray:
+        """The distance from the nearest source to each cell, as an array of the shape of
+        the grid. INFINITY if unreachable.
+
+        Args:
+            sources: The positions to start from
+            targets: If provided, stop once the first of these is reached. Only the
+                distances up to that of the reached target are final
+        """
+        neighbors = (
+            self._run_neighbors if self.tracks_direction else self._cell_neighbors
+        )
+        source_states = [state for source in sources for state in self.states(source)]
+        target_states = None
+        if targets is not None:
+            target_states = [
+                state for target in targets for state in self.states(target)
+            ]
+        distances = dijkstra(self.num_states, source_states, neighbors, target_states)
+        if self.tracks_direction:
+            distances = distances.reshape(-1, 2).min(axis=1)
+        return distances.reshape(self.height, self.width)
+
+    def shortest_distance(
+        self, sources: Iterable[tuple[int, int]], targets: Iterable[tuple[int, int]]
+    ) -> int:
+        """The distance of the shortest path from any source to any target.
+
+        Raises:
+            ValueError: If no target is reachable
+        """
+        targets = list(targets)
+        distances = self.distances(sources, targets)
+        distance = min(distances[tuple(target)] for target in targets)
+        if distance == INFINITY:
+            raise ValueError("No target is reachable from the sources")
+        return int(distance)
@@ -0,0 +1,154 @@
+import ast
+import re
+import sys
+import types
+from dataclasses import dataclass
+from pathlib import Path
+
+from adventofcode.helpers.config import solution_years, solutions_dir
+
+
+def solution_files(
+    years: list[int] | None = None, days: list[int] | None = None
+) -> list[Path]:
+    """Find all solution files, ordered by year and day.
+
+    Args:
+        years: Only include these years. If None or empty, include all years
+        days: Only include these days. If None or empty, include all days
+    """
+    files = []
+    for year in years or solution_years():
+        for path in sorted(solutions_dir(year).glob("[0-9][0-9].py")):
+            if not days or int(path.stem) in days:
+                files.append(path.resolve())
+    return files
+
+
+@dataclass(frozen=True)
+class Solution:
+    """
+    A solution file, as found by scanning its source. Nothing is imported or
+    instantiated until load_class() or create() is called.
+
+    Attributes:
+        year: The year, taken from the directory name
+        day: The day, taken from the file name
+        path: The path to the solution file
+        class_name: The name of the PuzzleToSolve subclass in the file
+        template: The template module the puzzle class is based on
+    """
+
+    year: int
+    day: int
+    path: Path
+    class_name: str
+    template: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.year}/{self.day:02d}"
+
+    def load_class(self) -> type:
+        """Import the solution module (once), and return the puzzle class."""
+        return getattr(load_module(self.path), self.class_name)
+
+    def create(self):
+        """Instantiate the puzzle class. The puzzle backend is created lazily."""
+        return self.load_class()()
+
+
+# The import of the template, and the class that derives from it, as generated from
+# the day template. Scanning with these is much cheaper than parsing the whole file
+_TEMPLATE_IMPORT = re.compile(
+    r"^from (adventofcode\._templates\.\w+)\.puzzle_to_solve import PuzzleToSolve$",
+    re.MULTILINE,
+)
+_PUZZLE_CLASS = re.compile(r"^class (\w+)\(PuzzleToSolve\):", re.MULTILINE)
+
+
+def _scan_solution(path: Path) -> Solution | None:
+    """Find the puzzle class in a solution file, by scanning its source.
+
+    Only classes based on a PuzzleToSolve that is imported from
+    adventofcode._templates are considered. Returns None if there is none.
+    """
+    source = path.read_text(encoding="utf-8")
+    template = _TEMPLATE_IMPORT.search(source)
+    puzzle_class = _PUZZLE_CLASS.search(source)
+    if template is None or puzzle_class is None:
+        return None
+    return Solution(
+        year=int(path.parent.parent.name[1:]),
+        day=int(path.stem),
+        path=path,
+        class_name=puzzle_class.group(1),
+        template=template.group(1),
+    )
+
+
+def discover_solutions(
+    years: list[int] | None = None, days: list[int] | None = None
+) -> list[Solution]:
+    """Find all solutions, without importing them.
+
+    Files that do not contain a puzzle class based on one of the templates (eg the
+    2022 solutions, which use their own base class) are skipped.
+
+    Args:
+        years: Only include these years. If None or empty, include all years
+        days: Only include these days. If None or empty, include all days
+    """
+    solutions = [_scan_solution(path) for path in solution_files(years, days)]
+    return [solution for solution in solutions if solution is not None]
+
+
+def _is_entrypoint(node: ast.stmt) -> bool:
+    """Check whether a module-level statement runs the puzzle.
+
+    The solution files end with `puzzle = PuzzleN(); puzzle.solve()`. Both the
+    instantiation and the solve call are entrypoint statements.
+    """
+    if isinstance(node, ast.Assign):
+        return (
+            isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Name)
+            and node.value.func.id.startswith("Puzzle")
+        )
+    if isinstance(node, ast.Expr):
+        return (
+            isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Attribute)
+            and node.value.func.attr == "solve"
+        )
+    return False
+
+
+def load_module(path: Path) -> types.ModuleType:
+    """Import a solution file, without running the puzzle.
+
+    The source is parsed, the module-level entrypoint statements are dropped, and
+    the remainder is executed in a fresh module. The module is registered in
+    sys.modules, such that dataclasses and pickling can resolve it, and such that
+    it is executed only once.
+
+    Args:
+        path: The path to the solution file
+    """
+    path = Path(path).resolve()
+    name = f"adventofcode._{path.parent.parent.name[1:]}.solutions.day{path.stem}"
+    if name in sys.modules:
+        return sys.modules[name]
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    tree.body = [node for node in tree.body if not _is_entrypoint(node)]
+
+    module = types.ModuleType(name)
+    module.__file__ = str(path)
+    sys.modules[name] = module
+    try:
+        exec(compile(tree, str(path), "exec"), module.__dict__)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
@@ -0,0 +1,67 @@
+import heapq
+
+
+class UnionFind:
+    """
+    Disjoint sets of the elements 0..n - 1. Finding the set of an element compresses
+    the path to its root, and the smaller set is merged into the larger one, such
+    that both operations take nearly constant time.
+
+    Attributes:
+        parents: The parent of each element. A root is its own parent
+        sizes: The size of the set of each root. Only valid for roots
+        components: The number of disjoint sets
+    """
+
+    parents: list[int]
+    sizes: list[int]
+    components: int
+
+    def __init__(self, size: int):
+        self.parents = list(range(size))
+        self.sizes = [1] * size
+        self.components = size
+
+    def find(self, element: int) -> int:
+        """The root of the set of an element."""
+        parents = self.parents
+        while parents[element] != element:
+            # Path halving: point each visited element to its grandparent
+            parents[element] = parents[parents[element]]
+            element = parents[element]
+        return element
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets of two elements.
+
+        Returns:
+            Whether the sets were merged. False if the elements were in the same set
+        """
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.sizes[root_a] < self.sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parents[root_b] = root_a
+        self.sizes[root_a] += self.sizes[root_b]
+        self.components -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def size(self, element: int) -> int:
+        """The size of the set of an element."""
+        return self.sizes[self.find(element)]
+
+    def component_sizes(self) -> list[int]:
+        """The sizes of all sets, in no particular order."""
+        return [
+            self.sizes[element]
+            for element, parent in enumerate(self.parents)
+            if element == parent
+        ]
+
+    def largest_sizes(self, k: int) -> list[int]:
+        """The sizes of the k largest sets, largest first."""
+        return heapq.nlargest(k, self.component_sizes())
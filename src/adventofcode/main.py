@@ -1,9 +1,39 @@
 import datetime
+import json
 import logging
 import os
 import subprocess
+from pathlib import Path
+
 import click
-from adventofcode.helpers.config import TEMPLATE_VERSION, TEMPLATES_DIR, solutions_dir
+from adventofcode.helpers.baseline import (
+    compare_to_baseline,
+    load_baseline,
+    machine_speed,
+    not_compared,
+    save_baseline,
+    steady_results,
+)
+from adventofcode.helpers.benchmark import (
+    QUADRATIC_EXPONENT,
+    STAGES,
+    benchmark_rounds,
+    growth_exponent,
+    scaling_curve,
+)
+from adventofcode.helpers.config import (
+    BASELINE_FILE,
+    OFFLINE_ENV_VAR,
+    TEMPLATE_VERSION,
+    TEMPLATES_DIR,
+    solutions_dir,
+)
+from adventofcode.helpers.generators import GENERATORS
+from adventofcode.helpers.input_store import InputStore
+from adventofcode.helpers.microbenchmarks import grid_microbenchmark
+from adventofcode.helpers.profiling import top_functions
+from adventofcode.helpers.runner import create_tasks, run_tasks
+from adventofcode.helpers.solutions import discover_solutions
 # Set debug level to info
 logging.basicConfig(level=logging.INFO)
 
@@ -60,4 +90,423 @@ def start(year: int, day: int):
     Start a day. Ie create the file for the day, and open it in VS Code
     """
     path = create_file(year, day)
-    os.system(f"code -r {path}")
\ No newline at end of file
+    os.system(f"code -r {path}")
+
+
+@cli.command()
+@click.option(
+    "-y",
+    "--year",
+    "years",
+    type=int,
+    multiple=True,
+    help="The year(s) to benchmark. Defaults to all years",
+)
+@click.option(
+    "-d",
+    "--day",
+    "days",
+    type=int,
+    multiple=True,
+    help="The day(s) to benchmark. Defaults to all days",
+)
+@click.option(
+    "-n", "--repeats", type=int, default=5, help="The number of runs per stage"
+)
+@click.option(
+    "--test",
+    "use_test_input",
+    is_flag=True,
+    help="Benchmark on the test inputs instead of the actual inputs",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the timings as JSON to this file",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Read inputs from the local input store instead of aocd",
+)
+@click.option(
+    "--save-baseline",
+    "save",
+    is_flag=True,
+    help="Store the timings and peak memory as the baseline",
+)
+@click.option(
+    "--compare",
+    is_flag=True,
+    help="Compare the timings and peak memory to the baseline. Fails on a regression",
+)
+@click.option(
+    "--baseline",
+    "baseline_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=BASELINE_FILE,
+    help="The baseline file",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.2,
+    show_default=True,
+    help="The allowed slowdown (or memory growth) relative to the baseline",
+)
+def bench(
+    years,
+    days,
+    repeats: int,
+    use_test_input: bool,
+    output: Path | None,
+    offline: bool,
+    save: bool,
+    compare: bool,
+    baseline_file: Path,
+    threshold: float,
+):
+    """
+    Time parse_input, a and b of each solution separately
+    """
+    if offline:
+        os.environ[OFFLINE_ENV_VAR] = "1"
+    results, puzzles = {}, {}
+    for solution in discover_solutions(list(years), list(days)):
+        try:
+            puzzles[solution.key] = solution.create()
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning("Could not benchmark %s: %s", solution.key, e)
+            results[solution.key] = {"error": repr(e)}
+    rounds = benchmark_rounds(
+        puzzles, repeats, use_test_input, measure_memory=save or compare
+    )
+    for key, timings in rounds.items():
+        if isinstance(timings, Exception):
+            logging.warning("Could not benchmark %s: %s", key, timings)
+            results[key] = {"error": repr(timings)}
+            continue
+        results[key] = {stage: timings[stage].as_dict() for stage in STAGES}
+        for stage in STAGES:
+            click.echo(
+                f"{key} {stage:<12} median {timings[stage].median * 1000:10.2f}ms"
+                f"  p95 {timings[stage].p95 * 1000:10.2f}ms"
+                f"  min {timings[stage].min * 1000:10.2f}ms"
+            )
+    if output is not None:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        logging.info("Timings written to %s", output)
+    if compare:
+        baseline = load_baseline(baseline_file)
+        if baseline["use_test_input"] != use_test_input:
+            logging.warning("The baseline was not created with the same inputs")
+        comparisons = compare_to_baseline(results, baseline)
+        speed = machine_speed(steady_results(results), baseline)
+        click.echo(
+            f"The machine runs {speed:.2f}x the baseline times, the baseline times"
+            " below are corrected for that"
+        )
+        for comparison in comparisons:
+            click.echo(comparison.format(threshold))
+        for key, reason in not_compared(results, baseline).items():
+            click.echo(f"{key} not compared, {reason}")
+        regressions = [c for c in comparisons if c.is_regression(threshold)]
+        if regressions:
+            raise click.ClickException(
+                f"{len(regressions)} regression(s) of more than {threshold:.0%}"
+            )
+    if save:
+        excluded = save_baseline(baseline_file, results, use_test_input)
+        for key, error in excluded.items():
+            logging.warning("Left %s out of the baseline, it failed: %s", key, error)
+        logging.info("Baseline written to %s", baseline_file)
+
+
+@cli.command()
+@click.option(
+    "-y",
+    "--year",
+    type=int,
+    required=False,
+    default=datetime.datetime.today().year,
+    help="The year to run",
+)
+@click.option(
+    "-d", "--day", "days", type=int, multiple=True, help="The day(s) to run"
+)
+@click.option("--all", "all_days", is_flag=True, help="Run all days of the year")
+@click.option(
+    "-j",
+    "--jobs",
+    type=int,
+    default=None,
+    help="The number of worker processes. Defaults to the number of CPUs",
+)
+@click.option(
+    "--split-parts",
+    is_flag=True,
+    help="Run a and b of each day as independent tasks",
+)
+@click.option(
+    "-t",
+    "--timeout",
+    type=float,
+    default=None,
+    help="The time budget per part, in seconds",
+)
+@click.option(
+    "-m",
+    "--max-memory",
+    type=int,
+    default=None,
+    help="The memory budget per part, in MiB",
+)
+@click.option(
+    "--test",
+    "use_test_input",
+    is_flag=True,
+    help="Solve the test inputs instead of the actual inputs",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the report as JSON to this file",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Solve all parts, even if their answer for the same input and source is cached",
+)
+@click.option(
+    "--profile",
+    "profile_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Profile each part with cProfile, and write a .pstats per day/part to this directory",
+)
+@click.option(
+    "--top",
+    type=int,
+    default=15,
+    help="The number of functions to print per part when profiling",
+)
+@click.option(
+    "--parse-once",
+    is_flag=True,
+    help="Parse the input of each day once, and give each part its own copy",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Read inputs from the local input store instead of aocd",
+)
+def run(
+    year: int,
+    days,
+    all_days: bool,
+    jobs: int | None,
+    split_parts: bool,
+    timeout: float | None,
+    max_memory: int | None,
+    use_test_input: bool,
+    output: Path | None,
+    offline: bool,
+    no_cache: bool,
+    profile_dir: Path | None,
+    top: int,
+    parse_once: bool,
+):
+    """
+    Solve one or more days of a year in parallel. Answers are not submitted
+    """
+    if offline:
+        # Set before the workers are started, such that they inherit it
+        os.environ[OFFLINE_ENV_VAR] = "1"
+    if not all_days and not days:
+        raise click.UsageError("Provide --day or --all")
+    solutions = discover_solutions([year], None if all_days else list(days))
+    tasks = create_tasks(
+        solutions,
+        split_parts=split_parts,
+        use_test_input=use_test_input,
+        timeout=timeout,
+        use_cache=not no_cache,
+        profile_dir=profile_dir,
+        parse_once=parse_once,
+        max_memory=None if max_memory is None else max_memory * 2**20,
+    )
+    report = run_tasks(tasks, jobs)
+    for result in report.results:
+        seconds = "" if result.seconds is None else f"{result.seconds:10.3f}s"
+        status = "cached" if result.cached else result.status
+        click.echo(
+            f"{result.year}/{result.day:02d} {result.part} {status:<7} "
+            f"{seconds:>11} {result.answer if result.error is None else result.error}"
+        )
+    click.echo(f"Total wall time: {report.seconds:.3f}s")
+    for result in report.results:
+        if result.profile is not None:
+            click.echo(f"\n{result.year}/{result.day:02d} {result.part}: {result.profile}")
+            click.echo(top_functions(result.profile, top))
+    if output is not None:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report.as_dict(), f, indent=2)
+        logging.info("Report written to %s", output)
+
+
+@cli.command()
+@click.option(
+    "-y",
+    "--year",
+    type=int,
+    required=False,
+    default=datetime.datetime.today().year,
+    help="The year to store the input of",
+)
+@click.option(
+    "-d", "--day", "days", type=int, multiple=True, help="The day(s) to store"
+)
+@click.option(
+    "-f",
+    "--file",
+    "input_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Store the input from this file. By default, the input is copied from aocd",
+)
+def store(year: int, days, input_file: Path | None):
+    """
+    Add inputs (and known answers) to the local input store, for offline runs
+    """
+    input_store = InputStore()
+    if input_file is not None:
+        if len(days) != 1:
+            raise click.UsageError("Provide exactly one --day when using --file")
+        sha = input_store.put_input(
+            year, days[0], input_file.read_text(encoding="utf-8")
+        )
+        logging.info("Stored %s/%02d as %s", year, days[0], sha)
+        return
+    for day in days or [solution.day for solution in discover_solutions([year])]:
+        sha = input_store.import_from_aocd(year, day)
+        logging.info("Stored %s/%02d as %s", year, day, sha)
+
+
+@cli.command()
+@click.option(
+    "-y",
+    "--year",
+    "years",
+    type=int,
+    multiple=True,
+    help="The year(s) to measure. Defaults to all years",
+)
+@click.option(
+    "-d",
+    "--day",
+    "days",
+    type=int,
+    multiple=True,
+    help="The day(s) to measure. Defaults to all days with an input generator",
+)
+@click.option(
+    "-s",
+    "--scale",
+    "scales",
+    type=float,
+    multiple=True,
+    default=[1, 10, 100],
+    show_default=True,
+    help="The input scales, as multiplier on the number of elements",
+)
+@click.option(
+    "-n", "--repeats", type=int, default=1, help="The number of runs per stage"
+)
+@click.option(
+    "--max-seconds",
+    type=float,
+    default=60,
+    show_default=True,
+    help="Abort a stage that takes longer, and skip its larger scales",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the curves as JSON to this file",
+)
+def scaling(years, days, scales, repeats: int, max_seconds: float, output: Path | None):
+    """
+    Run solutions on synthetic inputs of increasing size, and fit the growth exponent
+    of each stage. Flags stages that grow quadratic or worse
+    """
+    results = {}
+    solutions = [
+        solution
+        for solution in discover_solutions(list(years), list(days))
+        if (solution.year, solution.day) in GENERATORS
+    ]
+    for solution in solutions:
+        try:
+            points = scaling_curve(
+                solution.create(), sorted(scales), repeats, max_seconds
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning("Could not measure %s: %s", solution.key, e)
+            results[solution.key] = {"error": repr(e)}
+            continue
+        results[solution.key] = {
+            "points": [vars(point) for point in points],
+            "exponents": {},
+        }
+        for stage in STAGES:
+            measured = [point for point in points if stage in point.seconds]
+            times = " ".join(
+                f"{point.scale:g}x {point.seconds[stage] * 1000:.1f}ms"
+                for point in measured
+            )
+            exponent = None
+            if len(measured) >= 2:
+                exponent = growth_exponent(
+                    [point.size for point in measured],
+                    [point.seconds[stage] for point in measured],
+                )
+            results[solution.key]["exponents"][stage] = exponent
+            flag = ""
+            if exponent is not None and exponent >= QUADRATIC_EXPONENT:
+                flag = "  QUADRATIC OR WORSE"
+            if len(measured) < len(scales):
+                flag += "  EXCEEDED BUDGET"
+            exponent_str = "   n/a" if exponent is None else f"{exponent:6.2f}"
+            click.echo(f"{solution.key} {stage:<12} k={exponent_str}  {times}{flag}")
+    if output is not None:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        logging.info("Curves written to %s", output)
+
+
+@cli.command()
+@click.option(
+    "-s",
+    "--scale",
+    type=float,
+    default=1,
+    help="Multiplier on the number of cells of the 140x140 grid",
+)
+@click.option("-n", "--repeats", type=int, default=5, help="Timed runs per operation")
+def microbench(scale: float, repeats: int):
+    """
+    Time the grid helpers of BaseMatrix on a random grid
+    """
+    for name, timings in grid_microbenchmark(scale, repeats).items():
+        click.echo(
+            f"{name:<30} median {timings.median * 1000:10.2f}ms"
+            f"  min {timings.min * 1000:10.2f}ms"
+            f"  peak {timings.peak_bytes / 2**10:10.1f}KiB"
+        )
@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from adventofcode._templates.v20231204.puzzle_to_solve import PuzzleToSolve
+from adventofcode.helpers.base_matrix import BaseMatrix
+
+GRID = """#..
+.#.
+..#"""
+
+
+class MutatingPuzzle(PuzzleToSolve):
+    """Part a fills the grid with walls, part b counts the walls."""
+
+    parse_once = True
+
+    def __init__(self, parse):
+        self.parse = parse
+        self.parse_count = 0
+
+    @property
+    def test_input(self) -> str:
+        return GRID
+
+    @property
+    def test_answer_a(self):
+        return 9
+
+    @property
+    def test_answer_b(self):
+        return 3
+
+    def parse_input(self, input_: str):
+        self.parse_count += 1
+        return self.parse(input_)
+
+    def a(self, grid):
+        for i in range(3):
+            for j in range(3):
+                grid[i, j] = "#"
+        return self.b(grid)
+
+    def b(self, grid):
+        return sum(grid[i, j] == "#" for i in range(3) for j in range(3))
+
+
+class TestParseOnce(unittest.TestCase):
+    parsers = {
+        "BaseMatrix": lambda input_: BaseMatrix(input_, pad=None),
+        "byte coded BaseMatrix": lambda input_: BaseMatrix(
+            input_, pad=None, byte_coded=True
+        ),
+        "ndarray": lambda input_: np.array([list(row) for row in input_.split("\n")]),
+        "nested lists, deep copied": lambda input_: _Grid(input_),
+    }
+
+    def test_mutation_does_not_leak_into_other_part(self):
+        for name, parse in self.parsers.items():
+            with self.subTest(name):
+                puzzle = MutatingPuzzle(parse)
+                self.assertEqual(puzzle.test_a(), 9)
+                self.assertEqual(puzzle.test_b(), 3)
+                self.assertEqual(puzzle.test_a(), 9)
+                self.assertEqual(puzzle.parse_count, 1)
+
+    def test_copy_is_not_the_parsed_input(self):
+        puzzle = MutatingPuzzle(self.parsers["BaseMatrix"])
+        parsed = puzzle.parse_input_once(GRID)
+        cached = puzzle._parsed_inputs[GRID]
+        self.assertIsNot(parsed, cached)
+        self.assertIsNot(parsed.data, cached.data)
+
+
+class _Grid:
+    """A grid without a specific copy, which falls back to a deepcopy."""
+
+    def __init__(self, input_: str):
+        self.rows = [list(row) for row in input_.split("\n")]
+
+    def __getitem__(self, key):
+        return self.rows[key[0]][key[1]]
+
+    def __setitem__(self, key, value):
+        self.rows[key[0]][key[1]] = value
+
+
+if __name__ == "__main__":
+    unittest.main()